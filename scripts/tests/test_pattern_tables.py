@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+8パターン評価（evaluate_*_pattern*）の回帰テスト
+
+パターン表のインデックス計算（_pattern_index）と、前年比評価用に派生させた表（summaryなし）が
+従来のif文による判定と同じ結果を返すことを確認します。
+
+実行方法:
+    python -m pytest scripts/tests/test_pattern_tables.py
+    python scripts/tests/test_pattern_tables.py
+"""
+
+import itertools
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.analysis.individual import (
+    _pattern_index,
+    evaluate_roe_eps_bps_pattern,
+    evaluate_per_pbr_roe_pattern,
+    evaluate_roe_eps_bps_pattern_by_cagr,
+    evaluate_per_pbr_roe_pattern_by_cagr,
+)
+
+# 3指標の増減（+: True, -: False）の組み合わせ（パターン1〜8の順）
+SIGNS = list(itertools.product([True, False], repeat=3))
+
+# 従来の実装の判定結果（パターン番号, 名称）
+ROE_EPS_BPS_NAMES = ["王道成長", "異常", "効率改善", "効率改善", "規模拡大", "異常", "規模維持", "全面悪化"]
+PER_PBR_ROE_NAMES = ["成長＋再評価", "成長＋期待先行", "期待先行", "期待先行", "成長＋割安", "成長＋割安", "割安", "全面悪化"]
+
+# 従来の実装のCAGR評価の総括（summary）
+ROE_EPS_BPS_SUMMARIES = [
+    "全期間で安定成長", "データの整合性を確認", "効率重視の経営", "規模縮小傾向",
+    "効率悪化しながら拡大", "データの整合性を確認", "リストラ局面", "全面的な業績悪化",
+]
+PER_PBR_ROE_SUMMARIES = [
+    "全期間で期待先行", "期待が先行しすぎ", "実力と期待の乖離", "実力不足で期待先行",
+    "実力向上で割安", "実力向上で適正評価", "実力低下で割安", "全面的な評価下落",
+]
+
+
+def _basis(labels, signs):
+    """判定根拠の文字列（例: 'ROE:+, EPS:-, BPS:+'）"""
+    return ", ".join(f"{label}:{'+' if sign else '-'}" for label, sign in zip(labels, signs))
+
+
+def test_pattern_index():
+    """(+, +, +) がインデックス0、(-, -, -) がインデックス7。真偽値以外はNone"""
+    assert [_pattern_index(*signs) for signs in SIGNS] == list(range(8))
+    assert _pattern_index(1, 0, 1) == _pattern_index(True, False, True)
+    assert _pattern_index(None, True, True) is None
+    assert _pattern_index(True, "+", True) is None
+
+
+def test_yoy_patterns():
+    """前年比評価: パターン番号・名称・判定根拠が従来と一致し、summaryを含まない"""
+    cases = [
+        (evaluate_roe_eps_bps_pattern, ROE_EPS_BPS_NAMES, ("ROE", "EPS", "BPS")),
+        (evaluate_per_pbr_roe_pattern, PER_PBR_ROE_NAMES, ("PER", "ROE", "PBR")),
+    ]
+    for evaluate, names, labels in cases:
+        for number, (signs, name) in enumerate(zip(SIGNS, names), 1):
+            result = evaluate(*signs)
+            assert result["pattern"] == number, (evaluate.__name__, signs)
+            assert result["name"] == name, (evaluate.__name__, signs)
+            assert result["basis"] == _basis(labels, signs)
+            assert "summary" not in result
+            assert result["evaluation"] and result["note"]
+
+
+def test_cagr_patterns():
+    """CAGR評価: 正（> 0）を+として判定し、パターン番号・総括が従来と一致"""
+    cases = [
+        (evaluate_roe_eps_bps_pattern_by_cagr, evaluate_roe_eps_bps_pattern, ROE_EPS_BPS_SUMMARIES),
+        (evaluate_per_pbr_roe_pattern_by_cagr, evaluate_per_pbr_roe_pattern, PER_PBR_ROE_SUMMARIES),
+    ]
+    for evaluate, evaluate_yoy, summaries in cases:
+        for number, (signs, summary) in enumerate(zip(SIGNS, summaries), 1):
+            cagrs = [5.0 if sign else -5.0 for sign in signs]
+            result = evaluate(*cagrs)
+            assert result["pattern"] == number, (evaluate.__name__, signs)
+            assert result["summary"] == summary, (evaluate.__name__, signs)
+            # summary以外は前年比評価と共通
+            assert {k: v for k, v in result.items() if k != "summary"} == evaluate_yoy(*signs)
+        # 0は+として扱わない
+        assert evaluate(0, 0, 0)["pattern"] == 8
+
+
+def test_unknown_patterns():
+    """判定できない場合はパターン0（CAGR評価はsummary付き）"""
+    for evaluate in (evaluate_roe_eps_bps_pattern, evaluate_per_pbr_roe_pattern):
+        result = evaluate(None, True, True)
+        assert result["pattern"] == 0 and result["basis"] == "N/A"
+        assert "summary" not in result
+    for evaluate in (evaluate_roe_eps_bps_pattern_by_cagr, evaluate_per_pbr_roe_pattern_by_cagr):
+        result = evaluate(None, 1.0, 1.0)
+        assert result["pattern"] == 0
+        assert result["summary"] == "CAGRを計算できませんでした"
+
+
+def test_results_are_independent_copies():
+    """戻り値を変更しても共有のパターン表に影響しない"""
+    result = evaluate_roe_eps_bps_pattern(True, True, True)
+    result["name"] = "変更"
+    result["extra"] = 1
+    assert evaluate_roe_eps_bps_pattern(True, True, True)["name"] == "王道成長"
+    assert "extra" not in evaluate_roe_eps_bps_pattern(True, True, True)
+
+    unknown = evaluate_per_pbr_roe_pattern_by_cagr(None, None, None)
+    unknown["summary"] = "変更"
+    assert evaluate_per_pbr_roe_pattern_by_cagr(None, None, None)["summary"] == "CAGRを計算できませんでした"
+
+
+def main():
+    """テストを順に実行"""
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} 件成功")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
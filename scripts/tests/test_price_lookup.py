@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+年度末株価の一括取得（JQuantsAPIClient.get_prices_at_dates）の回帰テスト
+
+APIは呼び出さず、日足データを返すメソッドを差し替えて検証します。
+
+実行方法:
+    python -m pytest scripts/tests/test_price_lookup.py
+    python scripts/tests/test_price_lookup.py
+"""
+
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.api.client import JQuantsAPIClient
+
+# テスト用の日足終値（2023-03-31は金曜、2024-03-30/31は休日）
+DAILY_CLOSES = {
+    "2021-01-12": 900.0,
+    "2022-03-31": 1000.0,
+    "2023-03-20": 1090.0,
+    "2023-03-31": 1100.0,
+    "2024-03-15": 1190.0,
+    "2024-03-29": 1200.0,
+}
+
+
+class FakeClient(JQuantsAPIClient):
+    """日足データをメモリ上の辞書から返すクライアント"""
+
+    def __init__(self, range_error=None):
+        super().__init__(api_key="test")
+        self.range_error = range_error
+        self.requests = []
+
+    def get_daily_bars(self, code=None, date=None, from_date=None, to_date=None):
+        self.requests.append({"date": date, "from": from_date, "to": to_date})
+        if from_date and self.range_error:
+            raise self.range_error
+        if date:
+            date = date if date[4:5] == "-" else f"{date[:4]}-{date[4:6]}-{date[6:8]}"
+            return [{"Date": d, "AdjC": p} for d, p in DAILY_CLOSES.items() if d == date]
+        return [
+            {"Date": d.replace("-", ""), "AdjC": p}
+            for d, p in DAILY_CLOSES.items() if from_date <= d <= to_date
+        ]
+
+
+def test_one_request_for_all_dates():
+    """全日付を1回の期間指定リクエストで取得し、指定時の形式のキーで返す"""
+    client = FakeClient()
+    prices = client.get_prices_at_dates("72030", ["2022-03-31", "20230331"])
+    assert prices == {"2022-03-31": 1000.0, "20230331": 1100.0}
+    assert client.requests == [{"date": None, "from": "2022-03-21", "to": "2023-03-31"}]
+
+
+def test_holiday_uses_previous_trading_day():
+    """休日は直前の営業日の終値（lookback_days日前まで）"""
+    client = FakeClient()
+    assert client.get_prices_at_dates("72030", ["2024-03-31"]) == {"2024-03-31": 1200.0}
+    # 2日前の営業日はlookback_days=1では対象外
+    assert client.get_prices_at_dates("72030", ["2024-03-31"], lookback_days=1) == {}
+    # ちょうどlookback_days日前は対象
+    assert client.get_prices_at_dates("72030", ["2024-03-31"], lookback_days=2) == {"2024-03-31": 1200.0}
+
+
+def test_no_trading_day_within_lookback():
+    """lookback_days日以内に営業日がない日付は含めない（それより前の終値を使わない）"""
+    client = FakeClient()
+    errors = {}
+    prices = client.get_prices_at_dates("72030", ["2023-03-31", "2022-12-31"], errors=errors)
+    assert prices == {"2023-03-31": 1100.0}
+    assert errors == {}
+
+
+def test_skips_pre_subscription_and_malformed_dates():
+    """サブスクリプション開始日より前・形式が不正な日付のみ除外し、開始日を切り上げる"""
+    client = FakeClient()
+    errors = {}
+    prices = client.get_prices_at_dates(
+        "72030", ["2020-03-31", "2021-01-15", "2023-13-45", "", "2023-03-31"], errors=errors
+    )
+    assert prices == {"2021-01-15": 900.0, "2023-03-31": 1100.0}
+    assert set(errors) == {"2020-03-31", "2023-13-45"}
+    assert client.requests[0]["from"] == JQuantsAPIClient.SUBSCRIPTION_START
+
+
+def test_range_error_falls_back_to_each_date():
+    """期間指定のリクエストが失敗した場合は日付ごとに取得"""
+    client = FakeClient(range_error=RuntimeError("400 Bad Request"))
+    errors = {}
+    prices = client.get_prices_at_dates("72030", ["2022-03-31", "2023-03-31"], errors=errors)
+    assert prices == {"2022-03-31": 1000.0, "2023-03-31": 1100.0}
+    assert errors == {}
+    # 期間指定1回 + 日付指定2回
+    assert [r["date"] for r in client.requests] == [None, "2022-03-31", "2023-03-31"]
+
+
+def test_no_valid_dates():
+    """有効な日付がない場合はリクエストしない"""
+    client = FakeClient()
+    assert client.get_prices_at_dates("72030", ["2019-03-31", "bad"]) == {}
+    assert client.requests == []
+
+
+def main():
+    """テストを順に実行"""
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} 件成功")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+XBRLParser._extract_subsection_from_textの回帰テスト
+
+正規表現の1回の検索と改行数から求めた開始行・終了行が、
+従来の1行ずつ全パターンを照合する実装と一致することを確認します。
+
+実行方法:
+    python -m pytest scripts/tests/test_subsection_search.py
+    python scripts/tests/test_subsection_search.py
+"""
+
+import random
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.analysis.xbrl_parser import XBRLParser
+
+
+def _baseline_extract_subsection(parser, text, start_patterns, end_patterns):
+    """従来の実装（行ごとの照合）によるサブセクション抽出"""
+    lines = parser._normalize_text(text).split('\n')
+
+    start_idx = None
+    for i, line in enumerate(lines):
+        if any(pattern in line for pattern in start_patterns):
+            start_idx = i
+            break
+    if start_idx is None:
+        return None
+
+    end_idx = None
+    for i in range(start_idx + 1, len(lines)):
+        if any(pattern in lines[i] for pattern in end_patterns):
+            end_idx = i
+            break
+    if end_idx is None:
+        end_idx = min(start_idx + 1000, len(lines))
+
+    extracted_text = '\n'.join(lines[start_idx:end_idx]).strip()
+    return extracted_text if extracted_text else None
+
+
+def _assert_same(text, start_patterns, end_patterns):
+    parser = XBRLParser()
+    actual = parser._extract_subsection_from_text(text, start_patterns, end_patterns)
+    expected = _baseline_extract_subsection(parser, text, start_patterns, end_patterns)
+    assert actual == expected, (text, start_patterns, end_patterns, actual, expected)
+    return actual
+
+
+def test_start_to_end_line():
+    """開始パターンの行から終了パターンの行の直前まで"""
+    text = "前文\n（1）経営方針\n方針の本文\n方針の続き\n（2）経営環境\n環境の本文"
+    result = _assert_same(text, ["経営方針"], ["経営環境"])
+    assert result == "（1）経営方針\n方針の本文\n方針の続き"
+
+
+def test_end_pattern_on_start_line_is_ignored():
+    """開始行に終了パターンがあっても、終了は次の行以降から探す"""
+    text = "経営方針及び経営環境\n本文1\n本文2\n経営環境\n後続"
+    result = _assert_same(text, ["経営方針"], ["経営環境"])
+    assert result == "経営方針及び経営環境\n本文1\n本文2"
+
+
+def test_end_pattern_on_next_line():
+    """終了パターンが開始行の直後の行にある場合は開始行のみ"""
+    assert _assert_same("A開始\nB終了\nC", ["開始"], ["終了"]) == "A開始"
+
+
+def test_earliest_start_pattern_wins():
+    """複数の開始パターンのうち、最初に現れる行から開始"""
+    text = "x\n課題\nx\n方針\ny\n終了"
+    assert _assert_same(text, ["方針", "課題"], ["終了"]) == "課題\nx\n方針\ny"
+
+
+def test_no_end_pattern_until_limit():
+    """終了パターンがない場合は開始行から最大1000行まで"""
+    text = "開始\n" + "\n".join(f"行{i}" for i in range(1500))
+    result = _assert_same(text, ["開始"], ["存在しない"])
+    assert result.count("\n") == 999
+
+
+def test_start_on_last_line_and_missing_patterns():
+    """開始行が最終行の場合・開始パターンが見つからない場合・パターンが空の場合"""
+    assert _assert_same("本文\n最後に開始", ["開始"], ["終了"]) == "最後に開始"
+    assert _assert_same("本文のみ", ["開始"], ["終了"]) is None
+    assert _assert_same("開始\n本文\n終了", ["開始"], []) == "開始\n本文\n終了"
+
+
+def test_normalized_headings():
+    """_normalize_textで見出しの前に挿入された改行を含めて行番号を数える"""
+    text = "前文（1）経営方針本文です。【経営環境】環境の本文注1.注記"
+    _assert_same(text, ["経営方針"], ["経営環境"])
+    _assert_same(text, ["（1）"], ["注1."])
+
+
+def test_randomized_against_baseline():
+    """ランダムなテキスト・パターンで従来の実装と一致"""
+    rng = random.Random(20240401)
+    words = ["経営方針", "経営環境", "課題", "リスク", "本文", "（1）", "【見出し】", "注1.", "\n", "\n\n", " ", "。"]
+    for _ in range(500):
+        text = "".join(rng.choice(words) for _ in range(rng.randint(0, 40)))
+        start_patterns = rng.sample(words[:8], rng.randint(1, 3))
+        end_patterns = rng.sample(words[:8], rng.randint(0, 3))
+        _assert_same(text, start_patterns, end_patterns)
+
+
+def main():
+    """テストを順に実行"""
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} 件成功")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+XBRLParser.extract_sectionの回帰テスト
+
+インラインXBRL（HTML）のストリーミング解析による見出し・兄弟要素の抽出結果が、
+従来のBeautifulSoupによる実装と一致することを確認します。
+
+実行方法:
+    python -m pytest scripts/tests/test_xbrl_section_extraction.py
+    python scripts/tests/test_xbrl_section_extraction.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+bs4 = pytest.importorskip("bs4")
+pytest.importorskip("lxml")
+
+from src.analysis.xbrl_parser import XBRLParser
+
+POLICY_TITLE = "経営方針、経営環境及び対処すべき課題等"
+
+
+def _baseline_find_section(soup, section_title):
+    """従来の実装（BeautifulSoup）によるセクション検索"""
+    for heading in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+        if section_title in heading.get_text():
+            content = []
+            current = heading.next_sibling
+            while current:
+                if isinstance(current, bs4.Tag):
+                    if current.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+                        break
+                    text = current.get_text(strip=True)
+                    if text:
+                        content.append(text)
+                elif isinstance(current, str):
+                    text = current.strip()
+                    if text:
+                        content.append(text)
+                current = current.next_sibling
+            if content:
+                return "\n".join(content)
+
+    for elem in soup.find_all(['div', 'p', 'section']):
+        if section_title in elem.get_text():
+            return elem.get_text(separator="\n", strip=True)
+
+    return None
+
+
+def _baseline_extract_section(html_file, section_name):
+    """従来の実装（BeautifulSoup）によるセクション抽出（整形・切り詰めを含む）"""
+    soup = bs4.BeautifulSoup(html_file.read_text(encoding="utf-8"), "lxml")
+    section_text = _baseline_find_section(soup, section_name)
+    if not section_text:
+        return None
+    result = "\n".join(line.strip() for line in section_text.split("\n") if line.strip())
+    if len(result) > 10000:
+        result = result[:10000] + "..."
+    return result
+
+
+def _extract_both(body, section_name=POLICY_TITLE):
+    """同じHTMLを現在の実装と従来の実装で抽出"""
+    with tempfile.TemporaryDirectory() as tmp:
+        public_doc = Path(tmp) / "PublicDoc"
+        public_doc.mkdir()
+        html_file = public_doc / "0101010_honbun.htm"
+        html_file.write_text(f"<html><head><title>t</title></head><body>{body}</body></html>", encoding="utf-8")
+        return XBRLParser().extract_section(Path(tmp), section_name), _baseline_extract_section(html_file, section_name)
+
+
+def test_heading_until_next_heading():
+    """見出しから次の見出しまでの兄弟要素と要素間のテキストを抽出"""
+    actual, expected = _extract_both(
+        "<h2>1【経営方針、経営環境及び対処すべき課題等】</h2>"
+        "直後のテキスト"
+        "<p>（1）経営方針</p><p>当社は<span>持続的な</span>成長を目指します。</p>"
+        "間のテキスト"
+        "<div><p>入れ子の段落</p><p>2段落目</p></div>"
+        "<h2>2【事業等のリスク】</h2><p>リスクの本文</p>"
+    )
+    assert expected is not None and "リスクの本文" not in expected
+    assert actual == expected
+
+
+def test_skips_heading_without_content():
+    """本文のない見出し（目次など）は読み飛ばし、次に一致する見出しを使用"""
+    actual, expected = _extract_both(
+        "<h3>経営方針、経営環境及び対処すべき課題等</h3>"
+        "<h3>事業等のリスク</h3>"
+        "<h2>経営方針、経営環境及び対処すべき課題等</h2><p>本文</p><h2>次</h2>"
+    )
+    assert expected == "本文"
+    assert actual == expected
+
+
+def test_section_ends_with_parent():
+    """次の見出しがない場合は親要素の終わりまで（末尾のテキストを含む）を抽出"""
+    actual, expected = _extract_both(
+        "<div><h4>経営方針、経営環境及び対処すべき課題等</h4><p>段落1</p><table><tr><td>表</td></tr></table>末尾のテキスト</div>"
+        "<div><p>別のブロック</p></div>"
+    )
+    assert expected is not None and "別のブロック" not in expected
+    assert actual == expected
+
+
+def test_falls_back_to_block_elements():
+    """見出しがない場合はタイトルを含む最初のdiv/p/sectionのテキストを抽出"""
+    actual, expected = _extract_both(
+        "<div><span>経営方針、経営環境及び対処すべき課題等</span><p>本文1</p><p>本文2</p></div>"
+    )
+    assert expected is not None
+    assert actual == expected
+
+
+def test_not_found():
+    """セクションが見つからない場合はNone"""
+    actual, expected = _extract_both("<h2>事業の内容</h2><p>本文</p>")
+    assert expected is None
+    assert actual is None
+
+
+def test_large_file_across_chunks():
+    """読み込み単位（64KB）をまたぐ見出し・本文と、10,000文字での切り詰め"""
+    filler = "".join(f"<p>前置き{i}</p>" for i in range(6000))
+    body = "".join(f"<p>段落{i}の本文です。</p>" for i in range(2000))
+    actual, expected = _extract_both(
+        f"{filler}<h2>経営方針、経営環境及び対処すべき課題等</h2>{body}<h2>次の見出し</h2>"
+    )
+    assert expected is not None and expected.endswith("...")
+    assert actual == expected
+
+
+def main():
+    """テストを順に実行"""
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} 件成功")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -118,6 +118,78 @@ def calculate_growth_rate(
         return calculate_cagr(latest, oldest, years)
 
 
+def _to_float(value: Any) -> Optional[float]:
+    """
+    値をfloatに変換（Noneや文字列の場合も処理）
+    
+    Args:
+        value: 変換する値
+        
+    Returns:
+        floatに変換した値。変換できない場合はNone
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return None
+    return None
+
+
+def _to_date_key(value: str) -> str:
+    """
+    日付をYYYY-MM-DD形式に統一（株価辞書のキー用）
+    
+    5文字目の区切り文字で書式を判定します（時刻付きのYYYY-MM-DDTHH:MM:SSも日付部分に揃える）。
+    
+    Args:
+        value: 日付（YYYYMMDD または YYYY-MM-DD）
+        
+    Returns:
+        YYYY-MM-DD形式の日付
+    """
+    if value[4:5] == "-":
+        return value[:10]
+    return f"{value[:4]}-{value[4:6]}-{value[6:8]}"
+
+
+def _is_valid_value(value: Any) -> bool:
+    """
+    主要財務データとして有効な値か判定（NaN、None、空文字列、0は無効）
+    
+    Args:
+        value: 判定する値
+        
+    Returns:
+        有効な値の場合はTrue
+    """
+    if value is None:
+        return False
+    if value == "":
+        return False
+    # NaNチェック（float('nan')やnumpy.nanなど）
+    if isinstance(value, float) and math.isnan(value):
+        return False
+    # pandasのNaNチェック
+    try:
+        import pandas as pd
+        if pd.isna(value):
+            return False
+    except (ImportError, TypeError, AttributeError):
+        pass
+    try:
+        num_value = float(value)
+        if math.isnan(num_value):
+            return False
+        return num_value != 0
+    except (ValueError, TypeError):
+        return False
+
+
 def calculate_metrics_flexible(
     annual_data: List[Dict[str, Any]],
     prices: Optional[Dict[str, float]] = None,
@@ -160,23 +232,15 @@ def calculate_metrics_flexible(
         if not fy_end:
             continue
         
-        # 未来の年度データを除外
+        # 未来の年度データを除外（形式が不明でパースできない場合は含める）
         try:
-            if len(fy_end) == 8:  # YYYYMMDD
-                year = int(fy_end[:4])
-                month = int(fy_end[4:6])
-            elif len(fy_end) == 10:  # YYYY-MM-DD
-                year = int(fy_end[:4])
-                month = int(fy_end[5:7])
-            else:
-                # 形式が不明な場合は含める
-                year = None
-                month = None
+            date_key = _to_date_key(fy_end)
+            year = int(date_key[:4])
+            month = int(date_key[5:7])
             
             # 現在日付より未来の年度は除外
-            if year is not None and month is not None:
-                if year > current_year or (year == current_year and month > current_month):
-                    continue
+            if year > current_year or (year == current_year and month > current_month):
+                continue
         except (ValueError, IndexError):
             # パースエラーは無視（含める）
             pass
@@ -188,40 +252,13 @@ def calculate_metrics_flexible(
         np = year_data.get("NP")
         eq = year_data.get("Eq")
         
-        # 値を数値に変換してチェック（NaN、None、空文字列、0は無効）
-        def is_valid_value(value):
-            if value is None:
-                return False
-            if value == "":
-                return False
-            # NaNチェック（float('nan')やnumpy.nanなど）
-            try:
-                import math
-                if isinstance(value, float) and math.isnan(value):
-                    return False
-            except (ImportError, TypeError):
-                pass
-            # pandasのNaNチェック
-            try:
-                import pandas as pd
-                if pd.isna(value):
-                    return False
-            except (ImportError, TypeError, AttributeError):
-                pass
-            try:
-                num_value = float(value)
-                if math.isnan(num_value):
-                    return False
-                return num_value != 0
-            except (ValueError, TypeError):
-                return False
-        
         # 全ての主要データが無効な場合、このレコードを除外
+        # （値を数値に変換してチェック。NaN、None、空文字列、0は無効）
         has_valid_data = (
-            is_valid_value(sales) or
-            is_valid_value(op) or
-            is_valid_value(np) or
-            is_valid_value(eq)
+            _is_valid_value(sales) or
+            _is_valid_value(op) or
+            _is_valid_value(np) or
+            _is_valid_value(eq)
         )
         
         if not has_valid_data:
@@ -259,32 +296,19 @@ def calculate_metrics_flexible(
         fy_end = year_data.get("CurFYEn")
         
         # 基本財務データ（数値に変換）
-        def to_float(value):
-            """値をfloatに変換"""
-            if value is None:
-                return None
-            if isinstance(value, (int, float)):
-                return float(value)
-            if isinstance(value, str):
-                try:
-                    return float(value)
-                except (ValueError, TypeError):
-                    return None
-            return None
-        
-        sales = to_float(year_data.get("Sales"))
-        op = to_float(year_data.get("OP"))
-        np = to_float(year_data.get("NP"))
-        eq = to_float(year_data.get("Eq"))
-        cfo = to_float(year_data.get("CFO"))
-        cfi = to_float(year_data.get("CFI"))
-        eps = to_float(year_data.get("EPS"))
-        bps = to_float(year_data.get("BPS"))
+        sales = _to_float(year_data.get("Sales"))
+        op = _to_float(year_data.get("OP"))
+        np = _to_float(year_data.get("NP"))
+        eq = _to_float(year_data.get("Eq"))
+        cfo = _to_float(year_data.get("CFO"))
+        cfi = _to_float(year_data.get("CFI"))
+        eps = _to_float(year_data.get("EPS"))
+        bps = _to_float(year_data.get("BPS"))
         # 配当性向（APIからは小数で返ってくるので100倍してパーセント値に変換）
-        payout_ratio_raw = to_float(year_data.get("PayoutRatioAnn"))
+        payout_ratio_raw = _to_float(year_data.get("PayoutRatioAnn"))
         payout_ratio = payout_ratio_raw * 100 if payout_ratio_raw is not None else None
         # 配当金総額（円単位）
-        div_total = to_float(year_data.get("DivTotalAnn"))
+        div_total = _to_float(year_data.get("DivTotalAnn"))
         
         # FCF計算
         fcf = None
@@ -302,16 +326,10 @@ def calculate_metrics_flexible(
             except (ValueError, TypeError, ZeroDivisionError):
                 roe = None
         
-        # 株価取得
+        # 株価取得（キーはYYYY-MM-DD形式に正規化して参照）
         price = None
         if prices and fy_end:
-            price_key = fy_end
-            if price_key in prices:
-                price = prices[price_key]
-            else:
-                price_key_alt = fy_end.replace("-", "")
-                if price_key_alt in prices:
-                    price = prices[price_key_alt]
+            price = prices.get(_to_date_key(fy_end))
         
         # PER計算
         per = None
@@ -503,28 +521,15 @@ def calculate_quarterly_metrics(
         quarter_end = quarter_data.get("_quarter_end_date") or quarter_data.get("CurFYEn")
         
         # 基本財務データ（数値に変換）
-        def to_float(value):
-            """値をfloatに変換（Noneや文字列の場合も処理）"""
-            if value is None:
-                return None
-            if isinstance(value, (int, float)):
-                return float(value)
-            if isinstance(value, str):
-                try:
-                    return float(value)
-                except (ValueError, TypeError):
-                    return None
-            return None
-        
-        sales = to_float(quarter_data.get("Sales"))
-        np = to_float(quarter_data.get("NP"))
-        eq = to_float(quarter_data.get("Eq"))
-        eps = to_float(quarter_data.get("EPS"))
-        bps = to_float(quarter_data.get("BPS"))
+        sales = _to_float(quarter_data.get("Sales"))
+        np = _to_float(quarter_data.get("NP"))
+        eq = _to_float(quarter_data.get("Eq"))
+        eps = _to_float(quarter_data.get("EPS"))
+        bps = _to_float(quarter_data.get("BPS"))
         
         # BPSが取得できない場合、Eq（純資産）と発行済み株式数から計算
         if bps is None:
-            sh_out = to_float(quarter_data.get("ShOutFY"))  # 発行済み株式数（千株）
+            sh_out = _to_float(quarter_data.get("ShOutFY"))  # 発行済み株式数（千株）
             if eq is not None and sh_out is not None and sh_out > 0:
                 # BPS = 純資産（円） / 発行済み株式数（千株） / 1000
                 # Eqは円単位、ShOutFYは千株単位なので、1000で割る必要がある
@@ -534,14 +539,7 @@ def calculate_quarterly_metrics(
         price = None
         if prices and quarter_end:
             # 日付形式を統一して検索
-            if len(quarter_end) == 8:  # YYYYMMDD
-                date_key = f"{quarter_end[:4]}-{quarter_end[4:6]}-{quarter_end[6:8]}"
-            elif len(quarter_end) == 10:  # YYYY-MM-DD
-                date_key = quarter_end
-            else:
-                date_key = quarter_end
-            
-            price = prices.get(date_key) or prices.get(quarter_end)
+            price = prices.get(_to_date_key(quarter_end)) or prices.get(quarter_end)
         
         # PER, PBRを計算
         per = None
@@ -5,8 +5,14 @@
 """
 
 import csv
+import heapq
 import logging
-from typing import List, Dict, Any, Optional, Callable
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict, Any, Optional, Callable, Iterable, Tuple
 from datetime import datetime
 from pathlib import Path
 
@@ -14,23 +20,131 @@ import pandas as pd
 from tqdm import tqdm
 
 from ..api.client import JQuantsAPIClient
-from ..utils.financial_data import extract_annual_data
+from ..utils.financial_data import extract_annual_data_with_stats, _calculate_quarter_end_date
 from ..utils.cache import CacheManager
 from ..analysis.calculator import calculate_metrics_flexible
 from ..config import config
 
 logger = logging.getLogger(__name__)
 
-# EDINET統合（オプション）
-try:
-    from ..api.edinet_client import EdinetAPIClient
-    from ..analysis.xbrl_parser import XBRLParser
-    from ..analysis.llm_summarizer import LLMSummarizer
-    from ..utils.xbrl_compressor import compress_text
-    EDINET_AVAILABLE = True
-except ImportError:
-    EDINET_AVAILABLE = False
-    logger.debug("EDINET統合モジュールが利用できません。")
+# 履歴CSVの列順（固定）
+_CSV_FIELDS = (
+    "取得日時", "年度終了日", "売上高", "営業利益", "当期純利益",
+    "純資産", "営業CF", "投資CF", "FCF", "ROE", "EPS", "BPS",
+    "株価", "PER", "PBR", "FCF_CAGR", "ROE_CAGR", "EPS_CAGR",
+    "売上高CAGR", "PER_CAGR", "PBR_CAGR"
+)
+
+# 年度ごとの値の列（_CSV_FIELDSの「年度終了日」〜「PBR」に対応するキー）
+_CSV_YEAR_KEYS = (
+    "fy_end", "sales", "op", "np", "eq", "cfo", "cfi", "fcf",
+    "roe", "eps", "bps", "price", "per", "pbr"
+)
+
+# CAGR列（_CSV_FIELDSの末尾6列に対応するキー、最新年度の行のみ出力）
+_CSV_CAGR_KEYS = (
+    "fcf_cagr", "roe_cagr", "eps_cagr", "sales_cagr", "per_cagr", "pbr_cagr"
+)
+
+# EDINET検索対象とする期間種別
+_FY_Q2_TYPES = frozenset({"FY", "2Q"})
+
+# XBRLセクションの結合順（XBRLParser.COMMON_SECTIONSのセクションIDに対応）
+_SECTION_ORDER = ("A", "B", "C", "D", "E", "F")
+
+# J-QUANTS APIのサブスクリプション開始日（これより前の株価は取得できない）
+_SUB_START_STR = JQuantsAPIClient.SUBSCRIPTION_START
+
+# 年度末が休日の場合に遡る最大日数（直前の営業日の株価を使用）
+_PRICE_LOOKBACK_DAYS = 10
+
+# 直前の分析結果と比較する指標（履歴CSVの列名）
+_COMPARE_METRICS = (
+    "FCF", "ROE", "EPS", "PER", "PBR", "売上高",
+    "営業利益", "当期純利益", "営業CF"
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_fy_end_fast(fy_end: Optional[str]) -> Optional[Tuple[int, int, int]]:
+    """
+    年度終了日（YYYY-MM-DD形式またはYYYYMMDD形式）を (年, 月, 日) にパース
+    
+    datetime.strptimeを使わず、文字列スライスと整数変換のみで処理します。
+    年度終了日は3月末・12月末などに集中し銘柄をまたいで繰り返し現れるため、結果をキャッシュします。
+    
+    Args:
+        fy_end: 年度終了日
+        
+    Returns:
+        (年, 月, 日) のタプル。パースできない場合はNone
+    """
+    if not fy_end:
+        return None
+    # 5文字目の区切り文字で書式を判定（長さでは判定しない）
+    if fy_end[4:5] == "-":
+        y, m, d = fy_end[:4], fy_end[5:7], fy_end[8:10]
+    else:
+        y, m, d = fy_end[:4], fy_end[4:6], fy_end[6:8]
+    digits = y + m + d
+    if len(digits) != 8 or not digits.isdigit():
+        return None
+    month, day = int(m), int(d)
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return None
+    return int(y), month, day
+
+
+def _join_sections(sections: Dict[str, str]) -> str:
+    """
+    XBRLから抽出したセクションを順序付きで結合（A→B→C...の順、空のセクションは除外）
+    
+    Args:
+        sections: セクションIDをキー、テキストを値とする辞書
+        
+    Returns:
+        結合したテキスト
+    """
+    if len(sections) == 1:
+        # セクションが1つの場合は結合不要
+        return next(iter(sections.values())) or ""
+    return '\n\n'.join(text for text in (sections.get(section_id) for section_id in _SECTION_ORDER) if text)
+
+
+def _format_record_samples(records: Iterable[Dict[str, Any]]) -> List[str]:
+    """
+    財務データのサンプル表示用の行を作成
+    
+    Args:
+        records: 財務データ（表示する件数に絞り込み済み）
+        
+    Returns:
+        ログ出力用の行のリスト
+    """
+    lines = []
+    for i, record in enumerate(records):
+        lines.append(f"     {i+1}. 年度終了日: {record.get('CurFYEn', '')}, 開示日: {record.get('DiscDate', '')}")
+        lines.append(
+            f"        売上高: {record.get('Sales')}, 営業利益: {record.get('OP')}, "
+            f"当期純利益: {record.get('NP')}, 純資産: {record.get('Eq')}"
+        )
+    return lines
+
+
+def _describe_price_error(fy_end: str, error_msg: str) -> str:
+    """
+    株価取得エラーのログ用の説明を作成
+    
+    Args:
+        fy_end: 年度終了日
+        error_msg: エラーメッセージ
+    
+    Returns:
+        "日付 (理由)" 形式の文字列
+    """
+    if "subscription" in error_msg.lower() or "400" in error_msg or "サブスクリプション" in error_msg:
+        return f"{fy_end} (サブスクリプション範囲外)"
+    return f"{fy_end} ({error_msg[:50]})"
 
 
 class IndividualAnalyzer:
@@ -54,22 +168,78 @@ class IndividualAnalyzer:
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.cache = CacheManager() if use_cache else None
+        # プランに応じた最大分析年数（実行中は変わらないため初期化時に取得）
+        self._max_years = config.get_max_analysis_years()
         
-        # EDINET統合（オプション）
-        if EDINET_AVAILABLE:
+        # EDINET統合（オプション、初回参照時に_edinet()で読み込む）
+        self._edinet_loaded = False
+        self._edinet_client = None
+        self._xbrl_parser = None
+        self._llm_summarizer = None
+    
+    def _edinet(self) -> bool:
+        """
+        EDINET統合モジュールを必要になった時点で読み込み、クライアントを初期化
+        
+        EDINETを使わない処理では関連モジュールのimportコストがかからないようにします。
+        
+        Returns:
+            EDINETクライアントが利用可能な場合はTrue
+        """
+        if not self._edinet_loaded:
+            self._edinet_loaded = True
             try:
-                self.edinet_client = EdinetAPIClient()
-                self.xbrl_parser = XBRLParser()  # XBRLは要約用
-                self.llm_summarizer = LLMSummarizer()
+                from ..api.edinet_client import EdinetAPIClient
+                from ..analysis.xbrl_parser import XBRLParser
+                from ..analysis.llm_summarizer import LLMSummarizer
+            except ImportError:
+                logger.debug("EDINET統合モジュールが利用できません。")
+                return False
+            
+            try:
+                self._edinet_client = EdinetAPIClient()
+                self._xbrl_parser = XBRLParser()  # XBRLは要約用
+                self._llm_summarizer = LLMSummarizer()
             except Exception as e:
                 logger.warning(f"EDINETクライアントの初期化に失敗しました: {e}")
-                self.edinet_client = None
-                self.xbrl_parser = None
-                self.llm_summarizer = None
-        else:
-            self.edinet_client = None
-            self.xbrl_parser = None
-            self.llm_summarizer = None
+                self._edinet_client = None
+                self._xbrl_parser = None
+                self._llm_summarizer = None
+        
+        return self._edinet_client is not None
+    
+    @property
+    def edinet_client(self):
+        """EDINET APIクライアント（初回参照時に初期化、利用できない場合はNone）"""
+        self._edinet()
+        return self._edinet_client
+    
+    @edinet_client.setter
+    def edinet_client(self, value):
+        self._edinet()
+        self._edinet_client = value
+    
+    @property
+    def xbrl_parser(self):
+        """XBRL解析クラス（初回参照時に初期化、利用できない場合はNone）"""
+        self._edinet()
+        return self._xbrl_parser
+    
+    @xbrl_parser.setter
+    def xbrl_parser(self, value):
+        self._edinet()
+        self._xbrl_parser = value
+    
+    @property
+    def llm_summarizer(self):
+        """LLM要約クラス（初回参照時に初期化、利用できない場合はNone）"""
+        self._edinet()
+        return self._llm_summarizer
+    
+    @llm_summarizer.setter
+    def llm_summarizer(self, value):
+        self._edinet()
+        self._llm_summarizer = value
     
     def analyze_stock(
         self,
@@ -89,27 +259,33 @@ class IndividualAnalyzer:
         """
         cache_key = f"individual_analysis_{code}"
         
+        # J-QUANTS財務データは1回の分析中に1度だけ取得する
+        financial_data_cache: Dict[str, List[Dict[str, Any]]] = {}
+        
+        def _get_fs() -> List[Dict[str, Any]]:
+            if code not in financial_data_cache:
+                financial_data_cache[code] = self.api_client.get_financial_summary(code=code)
+            return financial_data_cache[code]
+        
         # キャッシュから取得を試みる
         if self.cache:
             cached_result = self.cache.get(cache_key)
             if cached_result is not None:
-                print(f"💾 キャッシュからデータを取得しました: {code}")
-                metrics = cached_result.get("metrics", {})
-                years = metrics.get("years", [])
-                analysis_years = metrics.get("analysis_years", len(years))
-                print(f"  キャッシュデータ: {len(years)}年分（分析年数: {analysis_years}年）")
+                if logger.isEnabledFor(logging.DEBUG):
+                    metrics = cached_result.get("metrics", {})
+                    years = metrics.get("years", [])
+                    analysis_years = metrics.get("analysis_years", len(years))
+                    logger.debug(f"💾 キャッシュからデータを取得しました: {code}（{len(years)}年分、分析年数: {analysis_years}年）")
                 
                 # EDINETデータがキャッシュにない場合のみ取得（無駄なAPI呼び出しを避ける）
                 cached_edinet_data = cached_result.get("edinet_data", {})
-                if self.edinet_client and not cached_edinet_data:
+                if not cached_edinet_data and self._edinet():
                     try:
                         logger.info(f"EDINET検索開始（キャッシュにEDINETデータなし）: code={code}")
                         # J-QUANTSデータから最新4データを取得（開示日基準、FY/2Q区別なし）
-                        from ..utils.financial_data import _calculate_quarter_end_date
-                        
                         # J-QUANTSデータを取得
                         try:
-                            financial_data = self.api_client.get_financial_summary(code=code)
+                            financial_data = _get_fs()
                         except Exception as e:
                             logger.warning(f"J-QUANTSデータ取得エラー: {e}")
                             financial_data = None
@@ -118,77 +294,10 @@ class IndividualAnalyzer:
                             logger.warning(f"J-QUANTSデータが取得できませんでした: code={code}")
                             return cached_result
                         
-                        # FYと2Qのデータのみを抽出
-                        fy_and_q2_records = [
-                            r for r in financial_data 
-                            if r.get("CurPerType") in ["FY", "2Q"]
-                        ]
-                        
-                        # DiscDateでソート（降順、最新が最初）
-                        all_records_sorted = sorted(
-                            fy_and_q2_records,
-                            key=lambda x: x.get("DiscDate", ""),
-                            reverse=True
-                        )
-                        
-                        # 最新4データを取得
-                        latest_4_records = all_records_sorted[:4]
-                        
-                        annual_data_for_edinet = []
-                        for record in latest_4_records:
-                            fy_end = record.get("CurFYEn", "")
-                            disc_date = record.get("DiscDate", "")
-                            period_type = record.get("CurPerType", "FY")
-                            
-                            # 年度を計算
-                            fiscal_year = None
-                            period_date = None
-                            period_end_str = fy_end  # デフォルトは年度終了日
-                            
-                            if fy_end:
-                                try:
-                                    if len(fy_end) >= 10:
-                                        period_date = datetime.strptime(fy_end[:10], "%Y-%m-%d")
-                                    elif len(fy_end) >= 8:
-                                        period_date = datetime.strptime(fy_end[:8], "%Y%m%d")
-                                    
-                                    if period_date:
-                                        # 3月末が年度終了日の場合、その年度は前年
-                                        if period_date.month == 3:
-                                            fiscal_year = period_date.year - 1
-                                        else:
-                                            fiscal_year = period_date.year
-                                        
-                                        # 2Qの場合は期間終了日を計算
-                                        if period_type == "2Q":
-                                            period_end_str = _calculate_quarter_end_date(fy_end, "2Q")
-                                            if not period_end_str:
-                                                period_end_str = fy_end  # 計算失敗時は年度終了日を使用
-                                except (ValueError, TypeError):
-                                    pass
-                            
-                            # EDINET検索用データとして保存
-                            if fy_end and disc_date:
-                                annual_data_for_edinet.append({
-                                    "CurFYEn": period_end_str,  # 2Qの場合は期間終了日、FYの場合は年度終了日
-                                    "DiscDate": disc_date,
-                                    "CurPerType": period_type,
-                                    "fiscal_year": fiscal_year,
-                                    "period_type": period_type
-                                })
-                        
-                        logger.info(f"EDINET検索用データ準備完了: {len(annual_data_for_edinet)}件（最新4データ、開示日基準）")
-                        logger.info(f"  - FYデータ: {len([d for d in annual_data_for_edinet if d.get('CurPerType') == 'FY'])}件")
-                        logger.info(f"  - 2Qデータ: {len([d for d in annual_data_for_edinet if d.get('CurPerType') == '2Q'])}件")
+                        annual_data_for_edinet = self._build_edinet_annual_data(financial_data)
                         
                         # 年度リストを作成（J-QUANTSデータから直接取得）
-                        years_list = []
-                        seen_years = set()
-                        for data in annual_data_for_edinet:
-                            fiscal_year = data.get("fiscal_year")
-                            if fiscal_year and fiscal_year not in seen_years:
-                                years_list.append(fiscal_year)
-                                seen_years.add(fiscal_year)
+                        years_list = list(dict.fromkeys(d["fiscal_year"] for d in annual_data_for_edinet if d["fiscal_year"]))
                         
                         if not years_list:
                             # 年度が取得できない場合は、直近3年を試す
@@ -200,11 +309,6 @@ class IndividualAnalyzer:
                             years_list = sorted(years_list, reverse=True)
                             logger.info(f"EDINET検索対象年度（最新優先）: {years_list}（最新年度: {years_list[0]}年度）")
                         
-                        if financial_data:
-                            # キャッシュから取得した場合も、新規分析時と同じロジックを使用
-                            # FYと2Qを区別せず、開示日基準で最新4データを取得
-                            from ..utils.financial_data import _calculate_quarter_end_date
-                            
                         edinet_data = self.fetch_edinet_reports(code, years_list, jquants_annual_data=annual_data_for_edinet, progress_callback=progress_callback)
                         if edinet_data:
                             cached_result["edinet_data"] = edinet_data
@@ -217,149 +321,26 @@ class IndividualAnalyzer:
                     logger.info(f"EDINETデータはキャッシュから取得済み: code={code}, years={list(cached_edinet_data.keys())}")
                     
                     # 要約が含まれているか確認（修正前のキャッシュには要約が含まれていない可能性がある）
-                    needs_regeneration = False
-                    for year, year_data in cached_edinet_data.items():
-                        if not year_data.get("management_policy"):
-                            logger.info(f"要約が含まれていない年度を検出: code={code}, year={year}, 再生成を実行します")
-                            needs_regeneration = True
-                            break
+                    years_to_regen = [
+                        (year, year_data) for year, year_data in cached_edinet_data.items()
+                        if not year_data.get("management_policy")
+                    ]
+                    if years_to_regen:
+                        logger.info(f"要約が含まれていない年度を検出: code={code}, years={[year for year, _ in years_to_regen]}, 再生成を実行します")
                     
-                    # 要約が含まれていない場合は再生成
-                    if needs_regeneration and self.edinet_client and self.xbrl_parser and self.llm_summarizer:
+                    # 要約が含まれていない場合は、該当年度のみ年度ごとに並列で再生成
+                    if years_to_regen and self._edinet() and self.xbrl_parser and self.llm_summarizer:
                         logger.info(f"要約再生成開始: code={code}")
                         try:
-                            # 年度リストを取得
-                            years_list = list(cached_edinet_data.keys())
-                            
-                            # J-QUANTSデータを取得（EDINET検索用）
-                            try:
-                                financial_data = self.api_client.get_financial_summary(code=code)
-                            except Exception as e:
-                                logger.warning(f"J-QUANTSデータ取得エラー: {e}")
-                                financial_data = None
-                            
-                            annual_data_for_edinet = []
-                            if financial_data:
-                                from ..utils.financial_data import _calculate_quarter_end_date
-                                
-                                # FYと2Qのデータのみを抽出
-                                fy_and_q2_records = [
-                                    r for r in financial_data 
-                                    if r.get("CurPerType") in ["FY", "2Q"]
-                                ]
-                                
-                                # DiscDateでソート（降順、最新が最初）
-                                all_records_sorted = sorted(
-                                    fy_and_q2_records,
-                                    key=lambda x: x.get("DiscDate", ""),
-                                    reverse=True
-                                )
-                                
-                                # 最新4データを取得
-                                latest_4_records = all_records_sorted[:4]
-                                
-                                for record in latest_4_records:
-                                    fy_end = record.get("CurFYEn", "")
-                                    disc_date = record.get("DiscDate", "")
-                                    period_type = record.get("CurPerType", "FY")
-                                    
-                                    # 年度を計算
-                                    fiscal_year = None
-                                    period_date = None
-                                    period_end_str = fy_end
-                                    
-                                    if fy_end:
-                                        try:
-                                            if len(fy_end) >= 10:
-                                                period_date = datetime.strptime(fy_end[:10], "%Y-%m-%d")
-                                            elif len(fy_end) >= 8:
-                                                period_date = datetime.strptime(fy_end[:8], "%Y%m%d")
-                                            
-                                            if period_date:
-                                                if period_date.month == 3:
-                                                    fiscal_year = period_date.year - 1
-                                                else:
-                                                    fiscal_year = period_date.year
-                                                
-                                                if period_type == "2Q":
-                                                    period_end_str = _calculate_quarter_end_date(fy_end, "2Q")
-                                                    if not period_end_str:
-                                                        period_end_str = fy_end
-                                        except (ValueError, TypeError):
-                                            pass
-                                    
-                                    if fy_end and disc_date:
-                                        annual_data_for_edinet.append({
-                                            "CurFYEn": period_end_str,
-                                            "DiscDate": disc_date,
-                                            "CurPerType": period_type,
-                                            "fiscal_year": fiscal_year,
-                                            "period_type": period_type
-                                        })
-                            
-                            # 要約が含まれていない年度のみ再生成
-                            for year in years_list:
-                                year_data = cached_edinet_data.get(year, {})
-                                if not year_data.get("management_policy"):
-                                    # 該当年度の要約を再生成
-                                    xbrl_path = year_data.get("xbrl_path")
-                                    doc_id = year_data.get("docID")
-                                    
-                                    logger.info(f"要約再生成チェック: code={code}, year={year}, xbrl_path={xbrl_path}, docID={doc_id}")
-                                    
-                                    if not xbrl_path:
-                                        logger.warning(f"要約再生成スキップ: xbrl_pathが存在しません: code={code}, year={year}")
-                                        continue
-                                    
-                                    if not doc_id:
-                                        logger.warning(f"要約再生成スキップ: docIDが存在しません: code={code}, year={year}")
-                                        continue
-                                    
-                                    xbrl_dir = Path(xbrl_path)
-                                    if not xbrl_dir.exists():
-                                        logger.warning(f"要約再生成スキップ: XBRLディレクトリが存在しません: code={code}, year={year}, path={xbrl_path}")
-                                        continue
-                                    
-                                    logger.info(f"要約再生成開始: code={code}, year={year}, docID={doc_id}, xbrl_path={xbrl_path}")
-                                    try:
-                                        logger.info(f"XBRLセクション抽出開始: code={code}, year={year}, docID={doc_id}")
-                                        sections = self.xbrl_parser.extract_sections_by_type(xbrl_dir)
-                                        logger.info(f"XBRLセクション抽出結果: code={code}, year={year}, docID={doc_id}, セクション数={len(sections)}")
-                                        
-                                        # セクションを順序付きで結合（A→B→C...の順）
-                                        section_order = sorted(sections.keys())
-                                        xbrl_text_parts = []
-                                        for section_id in section_order:
-                                            text = sections[section_id]
-                                            if text:
-                                                xbrl_text_parts.append(text)
-                                        
-                                        xbrl_text = '\n\n'.join(xbrl_text_parts)
-                                        logger.info(f"XBRLテキスト結合結果: code={code}, year={year}, docID={doc_id}, 文字数={len(xbrl_text) if xbrl_text else 0}")
-                                        
-                                        if xbrl_text:
-                                            # 圧縮前のテキストを直接LLMに渡す（圧縮処理をスキップ）
-                                            logger.info(f"XBRLテキストをLLMに直接渡します（圧縮処理をスキップ）: code={code}, year={year}, docID={doc_id}, 文字数={len(xbrl_text)}")
-                                            
-                                            llm_model = self.llm_summarizer.model if self.llm_summarizer else "不明"
-                                            logger.info(f"LLM要約開始: code={code}, year={year}, docID={doc_id}, モデル={llm_model}, 入力文字数={len(xbrl_text)}")
-                                            summary = self.llm_summarizer.summarize_text(
-                                                xbrl_text,
-                                                "経営方針・課題",
-                                                doc_id=doc_id,
-                                                use_cache=False  # 再生成時はキャッシュを使わない
-                                            )
-                                            logger.info(f"LLM要約完了: code={code}, year={year}, docID={doc_id}, 文字数={len(summary) if summary else 0}")
-                                            
-                                            if summary:
-                                                year_data["management_policy"] = summary
-                                                logger.info(f"要約再生成成功: code={code}, year={year}")
-                                            else:
-                                                logger.warning(f"要約再生成失敗: 要約が空です: code={code}, year={year}")
-                                        else:
-                                            logger.warning(f"要約再生成失敗: XBRLテキストが空です: code={code}, year={year}")
-                                    except Exception as e:
-                                        logger.error(f"要約再生成エラー: code={code}, year={year}, error={e}", exc_info=True)
+                            with ThreadPoolExecutor(max_workers=min(4, len(years_to_regen))) as executor:
+                                futures = {
+                                    executor.submit(self._regenerate_summary, code, year, year_data): year_data
+                                    for year, year_data in years_to_regen
+                                }
+                                for future in as_completed(futures):
+                                    _, summary = future.result()
+                                    if summary:
+                                        futures[future]["management_policy"] = summary
                             
                             # 更新されたedinet_dataをキャッシュに保存
                             cached_result["edinet_data"] = cached_edinet_data
@@ -378,66 +359,50 @@ class IndividualAnalyzer:
             stock_name = stock_info.get("CoName", "")
             
             if not stock_info:
-                logger.warning(f"銘柄コード {code}: 銘柄マスタにデータが見つかりませんでした。")
-                print(f"⚠️ 銘柄コード {code}: 銘柄マスタにデータが見つかりませんでした。")
+                logger.warning(f"⚠️ 銘柄コード {code}: 銘柄マスタにデータが見つかりませんでした。")
             
             # 財務データ取得
-            financial_data = self.api_client.get_financial_summary(code=code)
+            financial_data = _get_fs()
             
             if not financial_data:
-                logger.warning(f"銘柄コード {code}: 財務データが取得できませんでした。")
-                print(f"⚠️ 銘柄コード {code}: 財務データが取得できませんでした。")
-                if stock_name:
-                    print(f"   銘柄名: {stock_name}")
+                name_line = f"\n   銘柄名: {stock_name}" if stock_name else ""
+                logger.warning(f"⚠️ 銘柄コード {code}: 財務データが取得できませんでした。{name_line}")
                 return None
             
-            # デバッグ: APIから取得された生データの確認
             name_display = f" {stock_name}" if stock_name else ""
-            print(f"📥 APIから取得された財務データ: {len(financial_data)}件{name_display}")
-            fy_records = [r for r in financial_data if r.get("CurPerType") == "FY"]
-            print(f"📥 年度データ（CurPerType='FY'）: {len(fy_records)}件{name_display}")
-            if fy_records:
-                print("  年度終了日一覧:")
-                for record in fy_records[:10]:  # 最大10件を表示
-                    fy_end = record.get("CurFYEn", "")
-                    disc_date = record.get("DiscDate", "")
-                    print(f"    {fy_end} (開示日: {disc_date})")
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
             
-            # 年度データ抽出
+            # 年度データ抽出（CurPerType='FY'の件数もあわせて取得）
             try:
-                annual_data = extract_annual_data(financial_data)
+                annual_data, fy_record_count = extract_annual_data_with_stats(financial_data)
             except Exception as e:
-                logger.error(f"銘柄コード {code}: 年度データ抽出中にエラーが発生しました - {e}", exc_info=True)
-                print(f"❌ 銘柄コード {code}: 年度データ抽出中にエラーが発生しました - {e}")
+                logger.error(f"❌ 銘柄コード {code}: 年度データ抽出中にエラーが発生しました - {e}", exc_info=True)
                 return None
             
             if not annual_data:
-                # より詳細な情報を出力
-                fy_records = [r for r in financial_data if r.get("CurPerType") == "FY"]
-                print(f"⚠️ 銘柄コード {code}: 年度データが抽出できませんでした。")
-                print(f"   財務データ総数: {len(financial_data)}件")
-                print(f"   年度データ（CurPerType='FY'）: {len(fy_records)}件")
-                if fy_records:
-                    print(f"   年度データのサンプル（最初の3件）:")
-                    for i, record in enumerate(fy_records[:3]):
-                        fy_end = record.get("CurFYEn", "")
-                        disc_date = record.get("DiscDate", "")
-                        sales = record.get("Sales")
-                        op = record.get("OP")
-                        np = record.get("NP")
-                        eq = record.get("Eq")
-                        print(f"     {i+1}. 年度終了日: {fy_end}, 開示日: {disc_date}")
-                        print(f"        売上高: {sales}, 営業利益: {op}, 当期純利益: {np}, 純資産: {eq}")
-                logger.warning(f"銘柄コード {code}: 年度データが抽出できませんでした。財務データは {len(financial_data)}件取得できました。")
+                # より詳細な情報を1レコードにまとめて出力
+                detail_lines = [
+                    f"⚠️ 銘柄コード {code}: 年度データが抽出できませんでした。",
+                    f"   財務データ総数: {len(financial_data)}件",
+                    f"   年度データ（CurPerType='FY'）: {fy_record_count}件",
+                ]
+                if fy_record_count:
+                    # サンプル表示に必要な先頭3件だけを走査する
+                    fy_samples = islice((r for r in financial_data if r.get("CurPerType") == "FY"), 3)
+                    detail_lines.append("   年度データのサンプル（最初の3件）:")
+                    detail_lines.extend(_format_record_samples(fy_samples))
+                logger.warning("\n".join(detail_lines))
                 return None
             
-            # デバッグ: 取得された年度データの確認
-            name_display = f" {stock_name}" if stock_name else ""
-            print(f"📊 取得された年度データ: {len(annual_data)}年分{name_display}")
-            for i, year_data in enumerate(annual_data[:10]):  # 最大10年分を表示
-                fy_end = year_data.get("CurFYEn", "")
-                disc_date = year_data.get("DiscDate", "")
-                print(f"  {i+1}. 年度終了日: {fy_end}, 開示日: {disc_date}")
+            # デバッグ: APIから取得された財務データと取得された年度データの確認
+            if debug_enabled:
+                logger.debug(f"📥 APIから取得された財務データ: {len(financial_data)}件{name_display}")
+                logger.debug(f"📥 年度データ（CurPerType='FY'）: {fy_record_count}件{name_display}")
+                logger.debug(f"📊 取得された年度データ: {len(annual_data)}年分{name_display}")
+                for i, year_data in enumerate(annual_data[:10]):  # 最大10年分を表示
+                    fy_end = year_data.get("CurFYEn", "")
+                    disc_date = year_data.get("DiscDate", "")
+                    logger.debug(f"  {i+1}. 年度終了日: {fy_end}, 開示日: {disc_date}")
             
             # 年度末株価を取得（利用可能なデータを最大限使用）
             # 休日の場合は直前の営業日を使用
@@ -445,94 +410,81 @@ class IndividualAnalyzer:
             # 分析年数: 利用可能な年数を使用（最大10年まで）
             available_years = len(annual_data)
             # 利用可能なデータを最大限使用（最大10年まで）
-            max_years = config.get_max_analysis_years()
+            max_years = self._max_years
             analysis_years = min(available_years, max_years)
             
-            print(f"📈 分析年数: {analysis_years}年（利用可能: {available_years}年、最大: {max_years}年）{name_display}")
-            # J-QUANTS APIのサブスクリプション開始日（2021-01-09）より前のデータは取得できない
-            subscription_start_date = datetime(2021, 1, 9)
+            if debug_enabled:
+                logger.debug(f"📈 分析年数: {analysis_years}年（利用可能: {available_years}年、最大: {max_years}年）{name_display}")
             price_errors = []
+            target_dates = []
             for year_data in annual_data[:analysis_years]:
                 fy_end = year_data.get("CurFYEn")
                 if fy_end:
                     # 年度終了日の形式を統一（YYYY-MM-DD）
-                    if len(fy_end) == 8:  # YYYYMMDD形式
-                        fy_end_formatted = f"{fy_end[:4]}-{fy_end[4:6]}-{fy_end[6:8]}"
-                    else:
+                    if fy_end[4:5] == "-":
                         fy_end_formatted = fy_end
+                    else:  # YYYYMMDD形式
+                        fy_end_formatted = f"{fy_end[:4]}-{fy_end[4:6]}-{fy_end[6:8]}"
                     
                     # 年度終了日がサブスクリプション開始日より前の場合はスキップ
-                    try:
-                        if len(fy_end) == 8:  # YYYYMMDD形式
-                            fy_end_date = datetime.strptime(fy_end, "%Y%m%d")
-                        elif len(fy_end) >= 10:  # YYYY-MM-DD形式
-                            fy_end_date = datetime.strptime(fy_end[:10], "%Y-%m-%d")
-                        else:
-                            fy_end_date = None
-                        
-                        if fy_end_date and fy_end_date < subscription_start_date:
-                            # サブスクリプション開始日より前のデータはスキップ
-                            price_errors.append(f"{fy_end_formatted} (サブスクリプション範囲外)")
-                            continue
-                    except (ValueError, TypeError):
-                        # 日付パースに失敗した場合は続行
-                        pass
+                    # （YYYY-MM-DD形式の文字列は日付と同じ順序で比較できる）
+                    if fy_end_formatted[:10] < _SUB_START_STR:
+                        # サブスクリプション開始日より前のデータはスキップ
+                        price_errors.append(f"{fy_end_formatted} (サブスクリプション範囲外)")
+                        continue
                     
-                    # 休日の場合は直前の営業日を使用
-                    try:
-                        price = self.api_client.get_price_at_date(
-                            code, 
-                            fy_end_formatted,
-                            use_nearest_trading_day=True
-                        )
-                        if price:
-                            prices[fy_end_formatted] = price
-                            prices[fy_end.replace("-", "")] = price  # YYYYMMDD形式も保存
-                    except Exception as e:
-                        # 株価取得エラーを記録（サブスクリプション範囲外など）
-                        error_msg = str(e)
-                        if "subscription" in error_msg.lower() or "400" in error_msg:
-                            price_errors.append(f"{fy_end_formatted} (サブスクリプション範囲外)")
-                        else:
-                            price_errors.append(f"{fy_end_formatted} ({error_msg[:50]})")
+                    target_dates.append(fy_end_formatted)
+            
+            # 対象年度末をすべて含む期間の株価を1回のリクエストで取得し、
+            # 休日の場合は直前の営業日（最大10日前まで）の終値を使用
+            # （期間指定の取得が失敗した場合はクライアント側で日付ごとに取得し、失敗した日付のみ記録）
+            if target_dates:
+                fetch_errors: Dict[str, str] = {}
+                try:
+                    fy_end_prices = self.api_client.get_prices_at_dates(
+                        code, target_dates, _PRICE_LOOKBACK_DAYS, errors=fetch_errors
+                    )
+                except Exception as e:
+                    fy_end_prices = {}
+                    fetch_errors = dict.fromkeys(target_dates, str(e))
+                
+                # 株価取得エラーを記録（サブスクリプション範囲外など）
+                price_errors.extend(
+                    _describe_price_error(d, error_msg) for d, error_msg in fetch_errors.items()
+                )
+                
+                # キーはYYYY-MM-DD形式に統一（calculate_metrics_flexible側で正規化して参照）
+                prices.update((fy_end, price) for fy_end, price in fy_end_prices.items() if price)
             
             if price_errors:
-                print(f"⚠️ 株価取得エラー: {len(price_errors)}件（サブスクリプション範囲外の可能性）{name_display}")
-                print(f"   エラー詳細: {', '.join(price_errors[:5])}")
+                logger.warning(
+                    f"⚠️ 株価取得エラー: {len(price_errors)}件（サブスクリプション範囲外の可能性）{name_display}\n"
+                    f"   エラー詳細: {', '.join(price_errors[:5])}"
+                )
             
             # 指標計算（柔軟な年数対応）
             try:
-                print(f"🔧 指標計算開始: 年度データ {len(annual_data)}件, 分析年数 {analysis_years}年, 株価データ {len(prices)}件{name_display}")
+                if debug_enabled:
+                    logger.debug(f"🔧 指標計算開始: 年度データ {len(annual_data)}件, 分析年数 {analysis_years}年, 株価データ {len(prices)}件{name_display}")
                 metrics = calculate_metrics_flexible(annual_data, prices, analysis_years)
-                print(f"✅ 指標計算完了: metrics={'あり' if metrics else 'なし'}, years={'あり' if metrics and metrics.get('years') else 'なし'}{name_display}")
+                if debug_enabled:
+                    logger.debug(f"✅ 指標計算完了: metrics={'あり' if metrics else 'なし'}, years={'あり' if metrics and metrics.get('years') else 'なし'}{name_display}")
             except Exception as e:
-                logger.error(f"銘柄コード {code}: 指標計算中にエラーが発生しました - {e}", exc_info=True)
-                print(f"❌ 銘柄コード {code}: 指標計算中にエラーが発生しました - {e}")
-                import traceback
-                error_traceback = traceback.format_exc()
-                print(error_traceback)
-                # エラーの詳細をログに出力
-                logger.error(f"銘柄コード {code} の指標計算エラー詳細:\n{error_traceback}")
+                # exc_infoでトレースバックもあわせて出力
+                logger.error(f"❌ 銘柄コード {code}: 指標計算中にエラーが発生しました - {e}", exc_info=True)
                 return None
             
             if not metrics or not metrics.get("years"):
-                logger.warning(f"銘柄コード {code}: 指標が計算できませんでした。年度データは {len(annual_data)}件ありました。")
-                print(f"⚠️ 銘柄コード {code}: 指標が計算できませんでした。")
-                print(f"   metrics: {metrics}")
-                print(f"   年度データ数: {len(annual_data)}件")
-                print(f"   分析年数: {analysis_years}年")
-                print(f"   株価データ数: {len(prices)}件")
-                if annual_data:
-                    print(f"   年度データのサンプル（最初の3件）:")
-                    for i, year_data in enumerate(annual_data[:3]):
-                        fy_end = year_data.get("CurFYEn", "")
-                        disc_date = year_data.get("DiscDate", "")
-                        sales = year_data.get("Sales")
-                        op = year_data.get("OP")
-                        np = year_data.get("NP")
-                        eq = year_data.get("Eq")
-                        print(f"     {i+1}. 年度終了日: {fy_end}, 開示日: {disc_date}")
-                        print(f"        売上高: {sales}, 営業利益: {op}, 当期純利益: {np}, 純資産: {eq}")
+                detail_lines = [
+                    f"⚠️ 銘柄コード {code}: 指標が計算できませんでした。",
+                    f"   metrics: {metrics}",
+                    f"   年度データ数: {len(annual_data)}件",
+                    f"   分析年数: {analysis_years}年",
+                    f"   株価データ数: {len(prices)}件",
+                    "   年度データのサンプル（最初の3件）:",
+                ]
+                detail_lines.extend(_format_record_samples(annual_data[:3]))
+                logger.warning("\n".join(detail_lines))
                 return None
             
             result = {
@@ -550,84 +502,15 @@ class IndividualAnalyzer:
             }
             
             # EDINET統合: 有価証券報告書を取得
-            if self.edinet_client:
+            if self._edinet():
                 try:
                     logger.info(f"EDINET検索開始: code={code}")
                     # J-QUANTSの年度データを渡して検索を効率化
                     # FYと2Qを区別せず、開示日基準で最新4データを取得
-                    from ..utils.financial_data import _calculate_quarter_end_date
-                    
-                    # FYと2Qのデータのみを抽出
-                    fy_and_q2_records = [
-                        r for r in financial_data 
-                        if r.get("CurPerType") in ["FY", "2Q"]
-                    ]
-                    
-                    # DiscDateでソート（降順、最新が最初）
-                    all_records_sorted = sorted(
-                        fy_and_q2_records,
-                        key=lambda x: x.get("DiscDate", ""),
-                        reverse=True
-                    )
-                    
-                    # 最新4データを取得
-                    latest_4_records = all_records_sorted[:4]
-                    
-                    annual_data_for_edinet = []
-                    for record in latest_4_records:
-                        fy_end = record.get("CurFYEn", "")
-                        disc_date = record.get("DiscDate", "")
-                        period_type = record.get("CurPerType", "FY")
-                        
-                        # 年度を計算
-                        fiscal_year = None
-                        period_date = None
-                        period_end_str = fy_end  # デフォルトは年度終了日
-                        
-                        if fy_end:
-                            try:
-                                if len(fy_end) >= 10:
-                                    period_date = datetime.strptime(fy_end[:10], "%Y-%m-%d")
-                                elif len(fy_end) >= 8:
-                                    period_date = datetime.strptime(fy_end[:8], "%Y%m%d")
-                                
-                                if period_date:
-                                    # 3月末が年度終了日の場合、その年度は前年
-                                    if period_date.month == 3:
-                                        fiscal_year = period_date.year - 1
-                                    else:
-                                        fiscal_year = period_date.year
-                                    
-                                    # 2Qの場合は期間終了日を計算
-                                    if period_type == "2Q":
-                                        period_end_str = _calculate_quarter_end_date(fy_end, "2Q")
-                                        if not period_end_str:
-                                            period_end_str = fy_end  # 計算失敗時は年度終了日を使用
-                            except (ValueError, TypeError):
-                                pass
-                        
-                        # EDINET検索用データとして保存
-                        if fy_end and disc_date:
-                            annual_data_for_edinet.append({
-                                "CurFYEn": period_end_str,  # 2Qの場合は期間終了日、FYの場合は年度終了日
-                                "DiscDate": disc_date,
-                                "CurPerType": period_type,
-                                "fiscal_year": fiscal_year,
-                                "period_type": period_type
-                            })
-                    
-                    logger.info(f"EDINET検索用データ準備完了: {len(annual_data_for_edinet)}件（最新4データ、開示日基準）")
-                    logger.info(f"  - FYデータ: {len([d for d in annual_data_for_edinet if d.get('CurPerType') == 'FY'])}件")
-                    logger.info(f"  - 2Qデータ: {len([d for d in annual_data_for_edinet if d.get('CurPerType') == '2Q'])}件")
+                    annual_data_for_edinet = self._build_edinet_annual_data(financial_data)
                     
                     # 年度リストを作成（J-QUANTSデータから直接取得）
-                    years_list = []
-                    seen_years = set()
-                    for data in annual_data_for_edinet:
-                        fiscal_year = data.get("fiscal_year")
-                        if fiscal_year and fiscal_year not in seen_years:
-                            years_list.append(fiscal_year)
-                            seen_years.add(fiscal_year)
+                    years_list = list(dict.fromkeys(d["fiscal_year"] for d in annual_data_for_edinet if d["fiscal_year"]))
                     
                     if not years_list:
                         # 年度が取得できない場合は、直近3年を試す
@@ -659,9 +542,227 @@ class IndividualAnalyzer:
             return result
         
         except Exception as e:
-            print(f"エラー: {code} の分析に失敗しました: {e}")
+            logger.error(f"エラー: {code} の分析に失敗しました: {e}", exc_info=True)
             return None
     
+    def _process_report(
+        self,
+        code: str,
+        year: int,
+        report_info: Dict[str, Any]
+    ) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """
+        取得した有価証券報告書・半期報告書のXBRLを解析し、経営方針・課題を要約
+        
+        Args:
+            code: 銘柄コード
+            year: 年度
+            report_info: fetch_reportsで取得した書類情報
+            
+        Returns:
+            (年度, EDINETデータ) のタプル。docIDがない場合、EDINETデータはNone
+        """
+        doc_id = report_info.get("docID")
+        
+        if not doc_id:
+            logger.warning(f"docIDが存在しません: year={year}, report_info={report_info}")
+            return year, None
+        
+        result = {
+            "docID": doc_id,
+            "submitDate": report_info.get("submitDate", ""),
+            "pdf_path": report_info.get("pdf_path"),
+            "management_policy": "",
+            "docType": report_info.get("docType", "不明"),
+            "docTypeCode": report_info.get("docTypeCode", ""),
+            "docDescription": report_info.get("docDescription", ""),
+            "filerName": report_info.get("filerName", ""),  # 提出者名を追加
+        }
+        
+        # XBRL解析と要約（PDFはダウンロード用のみ、要約にはXBRLを使用）
+        xbrl_path = report_info.get("xbrl_path")
+        
+        # XBRLからテキストを抽出
+        if xbrl_path and self.xbrl_parser:
+            xbrl_dir = Path(xbrl_path)
+            
+            if not xbrl_dir.exists():
+                logger.warning(f"XBRLディレクトリが存在しません: {xbrl_path}")
+                return year, result
+            
+            logger.info(f"XBRL解析開始: code={code}, docID={doc_id}, xbrl_path={xbrl_path}, filerName={report_info.get('filerName', '不明')}")
+            
+            # XBRLから指定セクションを抽出
+            try:
+                logger.info(f"XBRLセクション抽出開始: docID={doc_id}")
+                sections = self.xbrl_parser.extract_sections_by_type(xbrl_dir)
+                logger.info(f"XBRLセクション抽出結果: docID={doc_id}, セクション数={len(sections)}")
+                
+                xbrl_text = _join_sections(sections)
+                logger.info(f"XBRLテキスト結合結果: docID={doc_id}, 文字数={len(xbrl_text)}")
+                
+                if xbrl_text:
+                    # 圧縮前のテキストを直接LLMに渡す（圧縮処理をスキップ）
+                    logger.info(f"XBRLテキストをLLMに直接渡します（圧縮処理をスキップ）: docID={doc_id}, 文字数={len(xbrl_text)}")
+                    
+                    if self.llm_summarizer:
+                        # LLMモデル名を取得
+                        llm_model = self.llm_summarizer.model if self.llm_summarizer else "不明"
+                        logger.info(f"LLM要約開始: docID={doc_id}, モデル={llm_model}, 入力文字数={len(xbrl_text)}")
+                        summary = self.llm_summarizer.summarize_text(
+                            xbrl_text,
+                            "経営方針・課題",
+                            doc_id=doc_id
+                        )
+                        logger.info(f"LLM要約完了: docID={doc_id}, 文字数={len(summary) if summary else 0}")
+                        result["management_policy"] = summary
+                    else:
+                        logger.warning(f"LLM要約クラスが初期化されていません: docID={doc_id}")
+                        result["management_policy"] = xbrl_text[:500] + "..." if len(xbrl_text) > 500 else xbrl_text
+                else:
+                    logger.warning(f"XBRLテキストが抽出できませんでした: docID={doc_id}")
+            except Exception as e:
+                logger.error(f"XBRL解析エラー: docID={doc_id}, error={e}", exc_info=True)
+        else:
+            logger.warning(f"XBRLディレクトリが見つかりません: docID={doc_id}, xbrl_path={xbrl_path}, xbrl_parser={self.xbrl_parser is not None}")
+        
+        return year, result
+    
+    def _regenerate_summary(
+        self,
+        code: str,
+        year: int,
+        year_data: Dict[str, Any]
+    ) -> Tuple[int, Optional[str]]:
+        """
+        キャッシュ済みのXBRLから指定年度の経営方針・課題の要約を再生成
+        
+        Args:
+            code: 銘柄コード
+            year: 年度
+            year_data: キャッシュ済みのEDINETデータ（該当年度分）
+            
+        Returns:
+            (年度, 要約) のタプル。再生成できなかった場合、要約はNone
+        """
+        xbrl_path = year_data.get("xbrl_path")
+        doc_id = year_data.get("docID")
+        
+        logger.info(f"要約再生成チェック: code={code}, year={year}, xbrl_path={xbrl_path}, docID={doc_id}")
+        
+        if not xbrl_path:
+            logger.warning(f"要約再生成スキップ: xbrl_pathが存在しません: code={code}, year={year}")
+            return year, None
+        
+        if not doc_id:
+            logger.warning(f"要約再生成スキップ: docIDが存在しません: code={code}, year={year}")
+            return year, None
+        
+        xbrl_dir = Path(xbrl_path)
+        if not xbrl_dir.exists():
+            logger.warning(f"要約再生成スキップ: XBRLディレクトリが存在しません: code={code}, year={year}, path={xbrl_path}")
+            return year, None
+        
+        logger.info(f"要約再生成開始: code={code}, year={year}, docID={doc_id}, xbrl_path={xbrl_path}")
+        try:
+            logger.info(f"XBRLセクション抽出開始: code={code}, year={year}, docID={doc_id}")
+            sections = self.xbrl_parser.extract_sections_by_type(xbrl_dir)
+            logger.info(f"XBRLセクション抽出結果: code={code}, year={year}, docID={doc_id}, セクション数={len(sections)}")
+            
+            if not sections:
+                logger.warning(f"要約再生成失敗: XBRLセクションが見つかりません: code={code}, year={year}")
+                return year, None
+            
+            xbrl_text = _join_sections(sections)
+            logger.info(f"XBRLテキスト結合結果: code={code}, year={year}, docID={doc_id}, 文字数={len(xbrl_text)}")
+            
+            if not xbrl_text:
+                logger.warning(f"要約再生成失敗: XBRLテキストが空です: code={code}, year={year}")
+                return year, None
+            
+            # 圧縮前のテキストを直接LLMに渡す（圧縮処理をスキップ）
+            llm_model = self.llm_summarizer.model if self.llm_summarizer else "不明"
+            logger.info(f"LLM要約開始: code={code}, year={year}, docID={doc_id}, モデル={llm_model}, 入力文字数={len(xbrl_text)}")
+            summary = self.llm_summarizer.summarize_text(
+                xbrl_text,
+                "経営方針・課題",
+                doc_id=doc_id,
+                use_cache=False  # 再生成時はキャッシュを使わない
+            )
+            logger.info(f"LLM要約完了: code={code}, year={year}, docID={doc_id}, 文字数={len(summary) if summary else 0}")
+            
+            if summary:
+                logger.info(f"要約再生成成功: code={code}, year={year}")
+                return year, summary
+            logger.warning(f"要約再生成失敗: 要約が空です: code={code}, year={year}")
+        except Exception as e:
+            logger.error(f"要約再生成エラー: code={code}, year={year}, error={e}", exc_info=True)
+        
+        return year, None
+    
+    def _build_edinet_annual_data(self, financial_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        J-QUANTSの財務データからEDINET検索用データを作成
+        
+        FYと2Qを区別せず、開示日基準で最新4データを抽出し、年度と期間終了日を付与します。
+        
+        Args:
+            financial_data: fin-summaryから取得した財務データ
+            
+        Returns:
+            EDINET検索用データのリスト（開示日の新しい順）
+        """
+        # FYと2Qのデータのみを抽出し、開示日（降順）で最新4データを取得
+        latest_4_records = heapq.nlargest(
+            4,
+            (r for r in financial_data if r.get("CurPerType") in _FY_Q2_TYPES),
+            key=lambda x: x.get("DiscDate") or ""
+        )
+        
+        annual_data_for_edinet = []
+        fy_count = 0
+        q2_count = 0
+        for record in latest_4_records:
+            fy_end = record.get("CurFYEn", "")
+            disc_date = record.get("DiscDate", "")
+            period_type = record.get("CurPerType", "FY")
+            
+            # 年度を計算
+            fiscal_year = None
+            period_end_str = fy_end  # デフォルトは年度終了日
+            
+            period_date = _parse_fy_end_fast(fy_end)
+            if period_date:
+                # 3月末が年度終了日の場合、その年度は前年
+                year, month, _ = period_date
+                if month == 3:
+                    fiscal_year = year - 1
+                else:
+                    fiscal_year = year
+                
+                # 2Qの場合は期間終了日を計算
+                # （_calculate_quarter_end_dateは年度終了日ごとにキャッシュ済み、計算失敗時は年度終了日を使用）
+                if period_type == "2Q":
+                    period_end_str = _calculate_quarter_end_date(fy_end, "2Q") or fy_end
+            
+            # EDINET検索用データとして保存
+            if fy_end and disc_date:
+                annual_data_for_edinet.append({
+                    "CurFYEn": period_end_str,  # 2Qの場合は期間終了日、FYの場合は年度終了日
+                    "DiscDate": disc_date,
+                    "CurPerType": period_type,
+                    "fiscal_year": fiscal_year,
+                    "period_type": period_type
+                })
+                if period_type == "FY":
+                    fy_count += 1
+                elif period_type == "2Q":
+                    q2_count += 1
+        
+        logger.info(f"EDINET検索用データ準備完了: {len(annual_data_for_edinet)}件（最新4データ、開示日基準）, FY={fy_count}件, 2Q={q2_count}件")
+        
+        return annual_data_for_edinet
+    
     def _save_to_csv(self, code: str, result: Dict[str, Any]):
         """
         分析結果をCSVに保存
@@ -678,53 +779,25 @@ class IndividualAnalyzer:
         if not years:
             return
         
-        # CSVデータを準備
-        rows = []
-        for year_data in years:
-            row = {
-                "取得日時": result.get("analyzed_at"),
-                "年度終了日": year_data.get("fy_end"),
-                "売上高": year_data.get("sales"),
-                "営業利益": year_data.get("op"),
-                "当期純利益": year_data.get("np"),
-                "純資産": year_data.get("eq"),
-                "営業CF": year_data.get("cfo"),
-                "投資CF": year_data.get("cfi"),
-                "FCF": year_data.get("fcf"),
-                "ROE": year_data.get("roe"),
-                "EPS": year_data.get("eps"),
-                "BPS": year_data.get("bps"),
-                "株価": year_data.get("price"),
-                "PER": year_data.get("per"),
-                "PBR": year_data.get("pbr"),
-            }
-            rows.append(row)
-        
-        # CAGRデータを追加
-        if rows:
-            rows[0]["FCF_CAGR"] = metrics.get("fcf_cagr")
-            rows[0]["ROE_CAGR"] = metrics.get("roe_cagr")
-            rows[0]["EPS_CAGR"] = metrics.get("eps_cagr")
-            rows[0]["売上高CAGR"] = metrics.get("sales_cagr")
-            rows[0]["PER_CAGR"] = metrics.get("per_cagr")
-            rows[0]["PBR_CAGR"] = metrics.get("pbr_cagr")
+        # CSVデータを準備（列順は_CSV_FIELDSに固定）
+        analyzed_at = result.get("analyzed_at")
+        # CAGRデータは最新年度の行のみに出力
+        latest_cagr = tuple(metrics.get(key) for key in _CSV_CAGR_KEYS)
+        empty_cagr = (None,) * len(_CSV_CAGR_KEYS)
+        rows = [
+            (analyzed_at,)
+            + tuple(year_data.get(key) for key in _CSV_YEAR_KEYS)
+            + (latest_cagr if i == 0 else empty_cagr)
+            for i, year_data in enumerate(years)
+        ]
         
         # CSVに追記（履歴として保存）
-        file_exists = csv_path.exists()
-        
+        # dtype=objectで値をそのまま出力（欠損値を含む整数列がfloatに変換されないようにする）
+        df = pd.DataFrame(rows, columns=list(_CSV_FIELDS), dtype=object)
         with open(csv_path, "a", newline="", encoding="utf-8") as f:
-            fieldnames = [
-                "取得日時", "年度終了日", "売上高", "営業利益", "当期純利益",
-                "純資産", "営業CF", "投資CF", "FCF", "ROE", "EPS", "BPS",
-                "株価", "PER", "PBR", "FCF_CAGR", "ROE_CAGR", "EPS_CAGR",
-                "売上高CAGR", "PER_CAGR", "PBR_CAGR"
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            
-            if not file_exists:
-                writer.writeheader()
-            
-            writer.writerows(rows)
+            # 開いたファイルのサイズでヘッダー要否を判定（存在確認の追加のstatを省く）
+            write_header = os.fstat(f.fileno()).st_size == 0
+            df.to_csv(f, header=write_header, index=False)
     
     def load_history(self, code: str) -> Optional[pd.DataFrame]:
         """
@@ -748,6 +821,30 @@ class IndividualAnalyzer:
             print(f"エラー: {code} の履歴読み込みに失敗しました: {e}")
             return None
     
+    def _tail_history(self, code: str, n: int = 2) -> List[Dict[str, str]]:
+        """
+        履歴CSVの末尾n行を読み込み
+        
+        DataFrameを作らず、末尾n行のみを保持しながら1行ずつ読み込みます。
+        
+        Args:
+            code: 銘柄コード
+            n: 読み込む行数
+            
+        Returns:
+            末尾n行（古い順）のリスト。履歴が存在しない場合は空リスト
+        """
+        csv_path = self.data_dir / f"{code}.csv"
+        
+        try:
+            with open(csv_path, "r", newline="", encoding="utf-8") as f:
+                return list(deque(csv.DictReader(f), maxlen=n))
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            logger.warning(f"{code} の履歴読み込みに失敗しました: {e}")
+            return []
+    
     def compare_with_previous(self, code: str) -> Optional[Dict[str, Any]]:
         """
         直前の分析結果と比較
@@ -758,14 +855,13 @@ class IndividualAnalyzer:
         Returns:
             比較結果の辞書
         """
-        history = self.load_history(code)
+        # 最新2回の分析結果（履歴の末尾2行）のみを取得
+        history = self._tail_history(code, n=2)
         
-        if history is None or len(history) < 2:
+        if len(history) < 2:
             return None
         
-        # 最新2回の分析結果を取得
-        latest = history.iloc[-1]
-        previous = history.iloc[-2]
+        previous, latest = history
         
         comparison = {
             "code": code,
@@ -774,32 +870,30 @@ class IndividualAnalyzer:
             "changes": {},
         }
         
-        # 各指標の変化を計算
-        metrics_to_compare = [
-            "FCF", "ROE", "EPS", "PER", "PBR", "売上高",
-            "営業利益", "当期純利益", "営業CF"
-        ]
+        # 各指標の変化をまとめて計算（数値に変換できない値はNaNとして除外）
+        values = pd.DataFrame(history, columns=list(_COMPARE_METRICS)).apply(pd.to_numeric, errors="coerce")
+        previous_vals = values.iloc[0]
+        latest_vals = values.iloc[1]
+        change = latest_vals - previous_vals
+        change_pct = change / previous_vals.abs() * 100
+        valid = latest_vals.notna() & previous_vals.notna() & (previous_vals != 0)
         
-        for metric in metrics_to_compare:
-            latest_val = latest.get(metric)
-            previous_val = previous.get(metric)
-            
-            if latest_val is not None and previous_val is not None:
-                try:
-                    latest_val = float(latest_val)
-                    previous_val = float(previous_val)
-                    
-                    if previous_val != 0:
-                        change_pct = ((latest_val - previous_val) / abs(previous_val)) * 100
-                        comparison["changes"][metric] = {
-                            "previous": previous_val,
-                            "latest": latest_val,
-                            "change": latest_val - previous_val,
-                            "change_pct": change_pct,
-                            "significant": abs(change_pct) >= 5.0,  # ±5%以上の変化
-                        }
-                except (ValueError, TypeError):
-                    pass
+        for metric, is_valid, prev_val, latest_val, diff, pct in zip(
+            _COMPARE_METRICS,
+            valid.to_numpy(),
+            previous_vals.to_numpy(),
+            latest_vals.to_numpy(),
+            change.to_numpy(),
+            change_pct.to_numpy(),
+        ):
+            if is_valid:
+                comparison["changes"][metric] = {
+                    "previous": float(prev_val),
+                    "latest": float(latest_val),
+                    "change": float(diff),
+                    "change_pct": float(pct),
+                    "significant": bool(abs(pct) >= 5.0),  # ±5%以上の変化
+                }
         
         return comparison
     
@@ -823,7 +917,7 @@ class IndividualAnalyzer:
         Returns:
             {year: {docID, submitDate, pdf_path, management_policy}} の辞書
         """
-        if not self.edinet_client:
+        if not self._edinet():
             error_msg = f"EDINETクライアントが初期化されていません: code={code}"
             logger.warning(error_msg)
             if progress_callback:
@@ -844,6 +938,8 @@ class IndividualAnalyzer:
             # 年度リストが降順でソートされていることを確認
             sorted_years = sorted(years, reverse=True) if years else []
             latest_year = sorted_years[0] if sorted_years else None
+            # リストを組み立てるログはINFOが有効な場合のみ出力
+            info_enabled = logger.isEnabledFor(logging.INFO)
             
             for year in sorted_years:
                 # 最新年度の場合は明示的に表示
@@ -857,7 +953,8 @@ class IndividualAnalyzer:
                 if reports:
                     all_reports.update(reports)
                     report_types = [r.get('docType', '不明') for r in reports.values()]
-                    logger.info(f"EDINET有価証券報告書・半期報告書が見つかりました: code={code}, year={year}, docIDs={[r.get('docID') for r in reports.values()]}, 書類種別={report_types}")
+                    if info_enabled:
+                        logger.info(f"EDINET有価証券報告書・半期報告書が見つかりました: code={code}, year={year}, docIDs={[r.get('docID') for r in reports.values()]}, 書類種別={report_types}")
                     # 最新年度の有価証券報告書・半期報告書が見つかったら、次の年度は検索しない
                     # 最初は最新年度だけを探す（ユーザー要求）
                     if progress_callback and year == latest_year:
@@ -880,106 +977,41 @@ class IndividualAnalyzer:
                     progress_callback(f"⚠️ **EDINET API検索結果**\n- {years}年度の有価証券報告書・半期報告書が見つかりませんでした\n- 検索条件を確認してください\n- ターミナルのログを確認してください")
                 return {}
             
-            logger.info(f"EDINET有価証券報告書・半期報告書取得成功: code={code}, years={list(all_reports.keys())}")
+            if info_enabled:
+                logger.info(f"EDINET有価証券報告書・半期報告書取得成功: code={code}, years={list(all_reports)}")
             
-            # 各年度の有価証券報告書・半期報告書を解析・要約
-            results = {}
+            # 各年度の有価証券報告書・半期報告書を解析・要約（年度ごとに並列実行）
+            # 進捗表示（Streamlit）はワーカースレッドから更新できないため、完了した年度ごとにメインスレッドで表示
+            llm_model = self.llm_summarizer.model if self.llm_summarizer else "不明"
+            if progress_callback:
+                progress_callback(f"📄 **{len(all_reports)}件の有価証券報告書・半期報告書を{llm_model}で分析中...**\n- XBRLを解析中")
             
-            for year, report_info in tqdm(all_reports.items(), desc="有価証券報告書・半期報告書解析中", leave=False):
-                doc_id = report_info.get("docID")
-                
-                if not doc_id:
-                    logger.warning(f"docIDが存在しません: year={year}, report_info={report_info}")
-                    continue
-                
-                result = {
-                    "docID": doc_id,
-                    "submitDate": report_info.get("submitDate", ""),
-                    "pdf_path": report_info.get("pdf_path"),
-                    "management_policy": "",
-                    "docType": report_info.get("docType", "不明"),
-                    "docTypeCode": report_info.get("docTypeCode", ""),
-                    "docDescription": report_info.get("docDescription", ""),
-                    "filerName": report_info.get("filerName", ""),  # 提出者名を追加
+            completed = {}
+            with ThreadPoolExecutor(max_workers=min(8, len(all_reports))) as executor:
+                futures = {
+                    executor.submit(self._process_report, code, year, report_info): (year, report_info)
+                    for year, report_info in all_reports.items()
                 }
-                
-                # XBRL解析と要約（PDFはダウンロード用のみ、要約にはXBRLを使用）
-                xbrl_path = report_info.get("xbrl_path")
-                pdf_path = report_info.get("pdf_path")  # PDFはダウンロード用のみ
-                
-                # 書類種別を取得
-                doc_type = result.get("docType", "不明")
-                doc_description = result.get("docDescription", "")
-                if doc_type == "不明" and doc_description:
-                    if "有価証券報告書" in doc_description:
-                        doc_type = "有価証券報告書"
-                    elif "半期報告書" in doc_description:
-                        doc_type = "半期報告書"
-                
-                # 年度を取得（年度ラベル用）
-                year_label = f"{year}年度"
-                
-                # XBRLからテキストを抽出
-                if xbrl_path and self.xbrl_parser:
-                    xbrl_dir = Path(xbrl_path)
-                    
-                    if not xbrl_dir.exists():
-                        logger.warning(f"XBRLディレクトリが存在しません: {xbrl_path}")
-                        results[year] = result
-                        continue
-                    
-                    logger.info(f"XBRL解析開始: code={code}, docID={doc_id}, xbrl_path={xbrl_path}, filerName={report_info.get('filerName', '不明')}")
-                    
+                finished = as_completed(futures)
+                # 件数が少ない場合（通常は1〜3件）はプログレスバーを表示しない
+                if len(all_reports) > 3:
+                    finished = tqdm(finished, total=len(all_reports), desc="有価証券報告書・半期報告書解析中", leave=False)
+                for done_count, future in enumerate(finished, 1):
+                    year, report_info = futures[future]
+                    _, result = future.result()
+                    if result is not None:
+                        completed[year] = result
                     if progress_callback:
-                        progress_callback(f"📄 **{year_label}{doc_type}を読み込み中...**\n- XBRLを解析中")
-                    
-                    # XBRLから指定セクションを抽出
-                    try:
-                        logger.info(f"XBRLセクション抽出開始: docID={doc_id}")
-                        sections = self.xbrl_parser.extract_sections_by_type(xbrl_dir)
-                        logger.info(f"XBRLセクション抽出結果: docID={doc_id}, セクション数={len(sections)}")
-                        
-                        # セクションを順序付きで結合（A→B→C...の順）
-                        section_order = sorted(sections.keys())
-                        xbrl_text_parts = []
-                        for section_id in section_order:
-                            text = sections[section_id]
-                            if text:
-                                xbrl_text_parts.append(text)
-                        
-                        xbrl_text = '\n\n'.join(xbrl_text_parts)
-                        logger.info(f"XBRLテキスト結合結果: docID={doc_id}, 文字数={len(xbrl_text) if xbrl_text else 0}")
-                        
-                        if xbrl_text:
-                            # 圧縮前のテキストを直接LLMに渡す（圧縮処理をスキップ）
-                            logger.info(f"XBRLテキストをLLMに直接渡します（圧縮処理をスキップ）: docID={doc_id}, 文字数={len(xbrl_text)}")
-                            
-                            if self.llm_summarizer:
-                                # LLMモデル名を取得
-                                llm_model = self.llm_summarizer.model if self.llm_summarizer else "不明"
-                                if progress_callback:
-                                    progress_callback(f"📄 **{year_label}{doc_type}を{llm_model}で分析中...**")
-                                logger.info(f"LLM要約開始: docID={doc_id}, モデル={llm_model}, 入力文字数={len(xbrl_text)}")
-                                summary = self.llm_summarizer.summarize_text(
-                                    xbrl_text,
-                                    "経営方針・課題",
-                                    doc_id=doc_id
-                                )
-                                logger.info(f"LLM要約完了: docID={doc_id}, 文字数={len(summary) if summary else 0}")
-                                result["management_policy"] = summary
-                            else:
-                                logger.warning(f"LLM要約クラスが初期化されていません: docID={doc_id}")
-                                result["management_policy"] = xbrl_text[:500] + "..." if len(xbrl_text) > 500 else xbrl_text
-                        else:
-                            logger.warning(f"XBRLテキストが抽出できませんでした: docID={doc_id}")
-                    except Exception as e:
-                        logger.error(f"XBRL解析エラー: docID={doc_id}, error={e}", exc_info=True)
-                else:
-                    logger.warning(f"XBRLディレクトリが見つかりません: docID={doc_id}, xbrl_path={xbrl_path}, xbrl_parser={self.xbrl_parser is not None}")
-                
-                results[year] = result
+                        progress_callback(
+                            f"📄 **{year}年度{report_info.get('docType', '不明')}の分析が完了しました（{done_count}/{len(all_reports)}件）**"
+                            + (f"\n- {llm_model}で残りの書類を分析中" if done_count < len(all_reports) else "")
+                        )
+            
+            # 結果は取得した年度の順に並べる
+            results = {year: completed[year] for year in all_reports if year in completed}
             
-            logger.info(f"EDINET要約完了: code={code}, years={list(results.keys())}")
+            if info_enabled:
+                logger.info(f"EDINET要約完了: code={code}, years={list(results)}")
             return results
         
         except Exception as e:
@@ -996,14 +1028,22 @@ class IndividualAnalyzer:
         Returns:
             レポート用データの辞書
         """
-        # 先に銘柄名を取得してログに表示
-        try:
-            master_data = self.api_client.get_equity_master(code=code)
-            stock_info = master_data[0] if master_data else {}
-            stock_name = stock_info.get("CoName", "")
-            name_display = f" {stock_name}" if stock_name else ""
-        except Exception:
-            name_display = ""
+        # キャッシュが有効な場合は銘柄名もキャッシュから取得（銘柄マスタのAPI呼び出しを省略）
+        cache_key = f"individual_analysis_{code}"
+        cached_result = self.cache.get(cache_key) if self.cache else None
+        
+        if cached_result is not None:
+            cached_name = cached_result.get("name", "")
+            name_display = f" {cached_name}" if cached_name else ""
+        else:
+            # 先に銘柄名を取得してログに表示
+            try:
+                master_data = self.api_client.get_equity_master(code=code)
+                stock_info = master_data[0] if master_data else {}
+                stock_name = stock_info.get("CoName", "")
+                name_display = f" {stock_name}" if stock_name else ""
+            except Exception:
+                name_display = ""
         
         print(f"🔍 get_report_data: {code}{name_display} の分析を開始します（キャッシュ: {'有効' if self.cache else '無効'}）")
         result = self.analyze_stock(code, save_data=True)
@@ -1026,14 +1066,205 @@ class IndividualAnalyzer:
         # 四半期データ取得・分析（機能削除済み）
         quarterly_metrics = None
         
-        report_data = {
-            **result,
-            "comparison": comparison,
-            "quarterly_metrics": quarterly_metrics,
-        }
+        # analyze_stockの戻り値は呼び出しごとに新しい辞書（キャッシュはpklから都度復元）のため、
+        # コピーせずにそのまま追記してレポート用データとする
+        report_data = result
+        report_data["comparison"] = comparison
+        report_data["quarterly_metrics"] = quarterly_metrics
         
         return report_data
     
+def _without_summary(pattern: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    パターン評価結果からCAGR評価専用のsummaryを除く
+    
+    Args:
+        pattern: パターン評価結果
+    
+    Returns:
+        summaryを除いたパターン評価結果
+    """
+    return {key: value for key, value in pattern.items() if key != 'summary'}
+
+
+# ROE/EPS/BPSの増減による8パターン（前年比・CAGR共通、summaryはCAGR評価のみで使用）
+# （インデックスは _pattern_index で計算、パターン1〜8の順）
+_ROE_EPS_BPS_TABLE: Tuple[Dict[str, Any], ...] = (
+    {
+        'pattern': 1,
+        'name': '王道成長',
+        'evaluation': '最良',
+        'note': '効率も規模も拡大',
+        'summary': '全期間で安定成長',
+        'basis': 'ROE:+, EPS:+, BPS:+'
+    },
+    {
+        'pattern': 2,
+        'name': '異常',
+        'evaluation': 'データ疑え',
+        'note': '数式矛盾（要確認）',
+        'summary': 'データの整合性を確認',
+        'basis': 'ROE:+, EPS:+, BPS:-'
+    },
+    {
+        'pattern': 3,
+        'name': '効率改善',
+        'evaluation': '良好',
+        'note': '効率↑×規模維持',
+        'summary': '効率重視の経営',
+        'basis': 'ROE:+, EPS:-, BPS:+'
+    },
+    {
+        'pattern': 4,
+        'name': '効率改善',
+        'evaluation': '要注意',
+        'note': '効率↑×規模縮小',
+        'summary': '規模縮小傾向',
+        'basis': 'ROE:+, EPS:-, BPS:-'
+    },
+    {
+        'pattern': 5,
+        'name': '規模拡大',
+        'evaluation': '良好',
+        'note': '効率↓×規模拡大',
+        'summary': '効率悪化しながら拡大',
+        'basis': 'ROE:-, EPS:+, BPS:+'
+    },
+    {
+        'pattern': 6,
+        'name': '異常',
+        'evaluation': 'データ疑え',
+        'note': '数式矛盾（要確認）',
+        'summary': 'データの整合性を確認',
+        'basis': 'ROE:-, EPS:+, BPS:-'
+    },
+    {
+        'pattern': 7,
+        'name': '規模維持',
+        'evaluation': '要注意',
+        'note': '効率↓×規模維持',
+        'summary': 'リストラ局面',
+        'basis': 'ROE:-, EPS:-, BPS:+'
+    },
+    {
+        'pattern': 8,
+        'name': '全面悪化',
+        'evaluation': '最悪',
+        'note': '効率も規模も縮小',
+        'summary': '全面的な業績悪化',
+        'basis': 'ROE:-, EPS:-, BPS:-'
+    },
+)
+
+
+# PER/PBR/ROEの増減による8パターン（前年比・CAGR共通、summaryはCAGR評価のみで使用）
+# （インデックスは _pattern_index で計算、パターン1〜8の順）
+_PER_PBR_ROE_TABLE: Tuple[Dict[str, Any], ...] = (
+    {
+        'pattern': 1,
+        'name': '成長＋再評価',
+        'evaluation': '初期良、後半注意',
+        'note': '実力↑×期待↑',
+        'summary': '全期間で期待先行',
+        'basis': 'PER:+, ROE:+, PBR:+'
+    },
+    {
+        'pattern': 2,
+        'name': '成長＋期待先行',
+        'evaluation': '要注意',
+        'note': '実力↑×期待過大',
+        'summary': '期待が先行しすぎ',
+        'basis': 'PER:+, ROE:+, PBR:-'
+    },
+    {
+        'pattern': 3,
+        'name': '期待先行',
+        'evaluation': '要注意',
+        'note': '実力↓×期待↑',
+        'summary': '実力と期待の乖離',
+        'basis': 'PER:+, ROE:-, PBR:+'
+    },
+    {
+        'pattern': 4,
+        'name': '期待先行',
+        'evaluation': '最悪',
+        'note': '実力↓×期待過大',
+        'summary': '実力不足で期待先行',
+        'basis': 'PER:+, ROE:-, PBR:-'
+    },
+    {
+        'pattern': 5,
+        'name': '成長＋割安',
+        'evaluation': '最良',
+        'note': '実力↑×期待↓',
+        'summary': '実力向上で割安',
+        'basis': 'PER:-, ROE:+, PBR:+'
+    },
+    {
+        'pattern': 6,
+        'name': '成長＋割安',
+        'evaluation': '良好',
+        'note': '実力↑×期待適正',
+        'summary': '実力向上で適正評価',
+        'basis': 'PER:-, ROE:+, PBR:-'
+    },
+    {
+        'pattern': 7,
+        'name': '割安',
+        'evaluation': '要注意',
+        'note': '実力↓×期待↓',
+        'summary': '実力低下で割安',
+        'basis': 'PER:-, ROE:-, PBR:+'
+    },
+    {
+        'pattern': 8,
+        'name': '全面悪化',
+        'evaluation': '最悪',
+        'note': '実力↓×期待↓',
+        'summary': '全面的な評価下落',
+        'basis': 'PER:-, ROE:-, PBR:-'
+    },
+)
+
+
+# パターン評価できない場合（データ不足）の結果
+_UNKNOWN_TABLE_ENTRY: Dict[str, Any] = {
+    'pattern': 0,
+    'name': '不明',
+    'evaluation': '評価不可',
+    'note': 'データ不足',
+    'summary': 'CAGRを計算できませんでした',
+    'basis': 'N/A'
+}
+
+# 評価関数が参照するパターン表（前年比評価はsummaryを除く）
+_ROE_EPS_BPS_PATTERNS: Tuple[Dict[str, Any], ...] = tuple(map(_without_summary, _ROE_EPS_BPS_TABLE))
+_PER_PBR_ROE_PATTERNS: Tuple[Dict[str, Any], ...] = tuple(map(_without_summary, _PER_PBR_ROE_TABLE))
+_ROE_EPS_BPS_CAGR_PATTERNS: Tuple[Dict[str, Any], ...] = _ROE_EPS_BPS_TABLE
+_PER_PBR_ROE_CAGR_PATTERNS: Tuple[Dict[str, Any], ...] = _PER_PBR_ROE_TABLE
+_UNKNOWN_PATTERN: Dict[str, Any] = _without_summary(_UNKNOWN_TABLE_ENTRY)
+_UNKNOWN_CAGR_PATTERN: Dict[str, Any] = _UNKNOWN_TABLE_ENTRY
+
+
+def _pattern_index(first: Any, second: Any, third: Any) -> Optional[int]:
+    """
+    3指標の増減（+: True, -: False）からパターン表のインデックスを計算
+    
+    (+, +, +) がパターン1（インデックス0）、(-, -, -) がパターン8（インデックス7）になります。
+    
+    Args:
+        first: 1つ目の指標の増減
+        second: 2つ目の指標の増減
+        third: 3つ目の指標の増減
+    
+    Returns:
+        インデックス（0〜7）。真偽値以外が含まれる場合はNone
+    """
+    if first not in (True, False) or second not in (True, False) or third not in (True, False):
+        return None
+    return 7 - ((bool(first) << 2) | (bool(second) << 1) | bool(third))
+
+
 def evaluate_roe_eps_bps_pattern(roe_change: bool, eps_change: bool, bps_change: bool) -> Dict[str, Any]:
     """
     ROE/EPS/BPSの前年比から8パターン評価
@@ -1052,74 +1283,9 @@ def evaluate_roe_eps_bps_pattern(roe_change: bool, eps_change: bool, bps_change:
             'basis': 'ROE:+, EPS:+, BPS:+'
         }
     """
-    # 8パターンのマッピング
-    patterns = {
-        (True, True, True): {
-            'pattern': 1,
-            'name': '王道成長',
-            'evaluation': '最良',
-            'note': '効率も規模も拡大',
-            'basis': 'ROE:+, EPS:+, BPS:+'
-        },
-        (True, True, False): {
-            'pattern': 2,
-            'name': '異常',
-            'evaluation': 'データ疑え',
-            'note': '数式矛盾（要確認）',
-            'basis': 'ROE:+, EPS:+, BPS:-'
-        },
-        (True, False, True): {
-            'pattern': 3,
-            'name': '効率改善',
-            'evaluation': '良好',
-            'note': '効率↑×規模維持',
-            'basis': 'ROE:+, EPS:-, BPS:+'
-        },
-        (True, False, False): {
-            'pattern': 4,
-            'name': '効率改善',
-            'evaluation': '要注意',
-            'note': '効率↑×規模縮小',
-            'basis': 'ROE:+, EPS:-, BPS:-'
-        },
-        (False, True, True): {
-            'pattern': 5,
-            'name': '規模拡大',
-            'evaluation': '良好',
-            'note': '効率↓×規模拡大',
-            'basis': 'ROE:-, EPS:+, BPS:+'
-        },
-        (False, True, False): {
-            'pattern': 6,
-            'name': '異常',
-            'evaluation': 'データ疑え',
-            'note': '数式矛盾（要確認）',
-            'basis': 'ROE:-, EPS:+, BPS:-'
-        },
-        (False, False, True): {
-            'pattern': 7,
-            'name': '規模維持',
-            'evaluation': '要注意',
-            'note': '効率↓×規模維持',
-            'basis': 'ROE:-, EPS:-, BPS:+'
-        },
-        (False, False, False): {
-            'pattern': 8,
-            'name': '全面悪化',
-            'evaluation': '最悪',
-            'note': '効率も規模も縮小',
-            'basis': 'ROE:-, EPS:-, BPS:-'
-        }
-    }
-    
-    key = (roe_change, eps_change, bps_change)
-    return patterns.get(key, {
-        'pattern': 0,
-        'name': '不明',
-        'evaluation': '評価不可',
-        'note': 'データ不足',
-        'basis': 'N/A'
-    })
+    index = _pattern_index(roe_change, eps_change, bps_change)
+    # 呼び出し側で変更できるようにコピーを返す
+    return dict(_UNKNOWN_PATTERN if index is None else _ROE_EPS_BPS_PATTERNS[index])
 
 
 def evaluate_per_pbr_roe_pattern(per_change: bool, roe_change: bool, pbr_change: bool) -> Dict[str, Any]:
@@ -1140,74 +1306,9 @@ def evaluate_per_pbr_roe_pattern(per_change: bool, roe_change: bool, pbr_change:
             'basis': 'PER:+, ROE:+, PBR:+'
         }
     """
-    # 8パターンのマッピング
-    patterns = {
-        (True, True, True): {
-            'pattern': 1,
-            'name': '成長＋再評価',
-            'evaluation': '初期良、後半注意',
-            'note': '実力↑×期待↑',
-            'basis': 'PER:+, ROE:+, PBR:+'
-        },
-        (True, True, False): {
-            'pattern': 2,
-            'name': '成長＋期待先行',
-            'evaluation': '要注意',
-            'note': '実力↑×期待過大',
-            'basis': 'PER:+, ROE:+, PBR:-'
-        },
-        (True, False, True): {
-            'pattern': 3,
-            'name': '期待先行',
-            'evaluation': '要注意',
-            'note': '実力↓×期待↑',
-            'basis': 'PER:+, ROE:-, PBR:+'
-        },
-        (True, False, False): {
-            'pattern': 4,
-            'name': '期待先行',
-            'evaluation': '最悪',
-            'note': '実力↓×期待過大',
-            'basis': 'PER:+, ROE:-, PBR:-'
-        },
-        (False, True, True): {
-            'pattern': 5,
-            'name': '成長＋割安',
-            'evaluation': '最良',
-            'note': '実力↑×期待↓',
-            'basis': 'PER:-, ROE:+, PBR:+'
-        },
-        (False, True, False): {
-            'pattern': 6,
-            'name': '成長＋割安',
-            'evaluation': '良好',
-            'note': '実力↑×期待適正',
-            'basis': 'PER:-, ROE:+, PBR:-'
-        },
-        (False, False, True): {
-            'pattern': 7,
-            'name': '割安',
-            'evaluation': '要注意',
-            'note': '実力↓×期待↓',
-            'basis': 'PER:-, ROE:-, PBR:+'
-        },
-        (False, False, False): {
-            'pattern': 8,
-            'name': '全面悪化',
-            'evaluation': '最悪',
-            'note': '実力↓×期待↓',
-            'basis': 'PER:-, ROE:-, PBR:-'
-        }
-    }
-    
-    key = (per_change, roe_change, pbr_change)
-    return patterns.get(key, {
-        'pattern': 0,
-        'name': '不明',
-        'evaluation': '評価不可',
-        'note': 'データ不足',
-        'basis': 'N/A'
-    })
+    index = _pattern_index(per_change, roe_change, pbr_change)
+    # 呼び出し側で変更できるようにコピーを返す
+    return dict(_UNKNOWN_PATTERN if index is None else _PER_PBR_ROE_PATTERNS[index])
 
 
 def evaluate_roe_eps_bps_pattern_by_cagr(roe_cagr: Optional[float], eps_cagr: Optional[float], bps_cagr: Optional[float]) -> Dict[str, Any]:
@@ -1230,95 +1331,15 @@ def evaluate_roe_eps_bps_pattern_by_cagr(roe_cagr: Optional[float], eps_cagr: Op
         }
     """
     if roe_cagr is None or eps_cagr is None or bps_cagr is None:
-        return {
-            'pattern': 0,
-            'name': '不明',
-            'evaluation': '評価不可',
-            'note': 'データ不足',
-            'summary': 'CAGRを計算できませんでした',
-            'basis': 'N/A'
-        }
+        return dict(_UNKNOWN_CAGR_PATTERN)
     
     roe_positive = roe_cagr > 0
     eps_positive = eps_cagr > 0
     bps_positive = bps_cagr > 0
     
-    patterns = {
-        (True, True, True): {
-            'pattern': 1,
-            'name': '王道成長',
-            'evaluation': '最良',
-            'note': '効率も規模も拡大',
-            'summary': '全期間で安定成長',
-            'basis': 'ROE:+, EPS:+, BPS:+'
-        },
-        (True, True, False): {
-            'pattern': 2,
-            'name': '異常',
-            'evaluation': 'データ疑え',
-            'note': '数式矛盾（要確認）',
-            'summary': 'データの整合性を確認',
-            'basis': 'ROE:+, EPS:+, BPS:-'
-        },
-        (True, False, True): {
-            'pattern': 3,
-            'name': '効率改善',
-            'evaluation': '良好',
-            'note': '効率↑×規模維持',
-            'summary': '効率重視の経営',
-            'basis': 'ROE:+, EPS:-, BPS:+'
-        },
-        (True, False, False): {
-            'pattern': 4,
-            'name': '効率改善',
-            'evaluation': '要注意',
-            'note': '効率↑×規模縮小',
-            'summary': '規模縮小傾向',
-            'basis': 'ROE:+, EPS:-, BPS:-'
-        },
-        (False, True, True): {
-            'pattern': 5,
-            'name': '規模拡大',
-            'evaluation': '良好',
-            'note': '効率↓×規模拡大',
-            'summary': '効率悪化しながら拡大',
-            'basis': 'ROE:-, EPS:+, BPS:+'
-        },
-        (False, True, False): {
-            'pattern': 6,
-            'name': '異常',
-            'evaluation': 'データ疑え',
-            'note': '数式矛盾（要確認）',
-            'summary': 'データの整合性を確認',
-            'basis': 'ROE:-, EPS:+, BPS:-'
-        },
-        (False, False, True): {
-            'pattern': 7,
-            'name': '規模維持',
-            'evaluation': '要注意',
-            'note': '効率↓×規模維持',
-            'summary': 'リストラ局面',
-            'basis': 'ROE:-, EPS:-, BPS:+'
-        },
-        (False, False, False): {
-            'pattern': 8,
-            'name': '全面悪化',
-            'evaluation': '最悪',
-            'note': '効率も規模も縮小',
-            'summary': '全面的な業績悪化',
-            'basis': 'ROE:-, EPS:-, BPS:-'
-        }
-    }
-    
-    key = (roe_positive, eps_positive, bps_positive)
-    return patterns.get(key, {
-        'pattern': 0,
-        'name': '不明',
-        'evaluation': '評価不可',
-        'note': 'データ不足',
-        'summary': 'CAGRを計算できませんでした',
-        'basis': 'N/A'
-    })
+    index = _pattern_index(roe_positive, eps_positive, bps_positive)
+    # 呼び出し側で変更できるようにコピーを返す
+    return dict(_UNKNOWN_CAGR_PATTERN if index is None else _ROE_EPS_BPS_CAGR_PATTERNS[index])
 
 
 def evaluate_per_pbr_roe_pattern_by_cagr(per_cagr: Optional[float], roe_cagr: Optional[float], pbr_cagr: Optional[float]) -> Dict[str, Any]:
@@ -1341,93 +1362,13 @@ def evaluate_per_pbr_roe_pattern_by_cagr(per_cagr: Optional[float], roe_cagr: Op
         }
     """
     if per_cagr is None or roe_cagr is None or pbr_cagr is None:
-        return {
-            'pattern': 0,
-            'name': '不明',
-            'evaluation': '評価不可',
-            'note': 'データ不足',
-            'summary': 'CAGRを計算できませんでした',
-            'basis': 'N/A'
-        }
+        return dict(_UNKNOWN_CAGR_PATTERN)
     
     per_positive = per_cagr > 0
     roe_positive = roe_cagr > 0
     pbr_positive = pbr_cagr > 0
     
-    patterns = {
-        (True, True, True): {
-            'pattern': 1,
-            'name': '成長＋再評価',
-            'evaluation': '初期良、後半注意',
-            'note': '実力↑×期待↑',
-            'summary': '全期間で期待先行',
-            'basis': 'PER:+, ROE:+, PBR:+'
-        },
-        (True, True, False): {
-            'pattern': 2,
-            'name': '成長＋期待先行',
-            'evaluation': '要注意',
-            'note': '実力↑×期待過大',
-            'summary': '期待が先行しすぎ',
-            'basis': 'PER:+, ROE:+, PBR:-'
-        },
-        (True, False, True): {
-            'pattern': 3,
-            'name': '期待先行',
-            'evaluation': '要注意',
-            'note': '実力↓×期待↑',
-            'summary': '実力と期待の乖離',
-            'basis': 'PER:+, ROE:-, PBR:+'
-        },
-        (True, False, False): {
-            'pattern': 4,
-            'name': '期待先行',
-            'evaluation': '最悪',
-            'note': '実力↓×期待過大',
-            'summary': '実力不足で期待先行',
-            'basis': 'PER:+, ROE:-, PBR:-'
-        },
-        (False, True, True): {
-            'pattern': 5,
-            'name': '成長＋割安',
-            'evaluation': '最良',
-            'note': '実力↑×期待↓',
-            'summary': '実力向上で割安',
-            'basis': 'PER:-, ROE:+, PBR:+'
-        },
-        (False, True, False): {
-            'pattern': 6,
-            'name': '成長＋割安',
-            'evaluation': '良好',
-            'note': '実力↑×期待適正',
-            'summary': '実力向上で適正評価',
-            'basis': 'PER:-, ROE:+, PBR:-'
-        },
-        (False, False, True): {
-            'pattern': 7,
-            'name': '割安',
-            'evaluation': '要注意',
-            'note': '実力↓×期待↓',
-            'summary': '実力低下で割安',
-            'basis': 'PER:-, ROE:-, PBR:+'
-        },
-        (False, False, False): {
-            'pattern': 8,
-            'name': '全面悪化',
-            'evaluation': '最悪',
-            'note': '実力↓×期待↓',
-            'summary': '全面的な評価下落',
-            'basis': 'PER:-, ROE:-, PBR:-'
-        }
-    }
-    
-    key = (per_positive, roe_positive, pbr_positive)
-    return patterns.get(key, {
-        'pattern': 0,
-        'name': '不明',
-        'evaluation': '評価不可',
-        'note': 'データ不足',
-        'summary': 'CAGRを計算できませんでした',
-        'basis': 'N/A'
-    })
+    index = _pattern_index(per_positive, roe_positive, pbr_positive)
+    # 呼び出し側で変更できるようにコピーを返す
+    return dict(_UNKNOWN_CAGR_PATTERN if index is None else _PER_PBR_ROE_CAGR_PATTERNS[index])
 
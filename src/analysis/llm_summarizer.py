@@ -4,8 +4,15 @@ LLM要約モジュール
 Ollamaを使用してテキストを要約します。
 """
 
+import hashlib
 import logging
-from typing import Optional
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import List, Optional
 from pathlib import Path
 
 try:
@@ -19,6 +26,205 @@ from ..config import config
 
 logger = logging.getLogger(__name__)
 
+# Ollamaへの同時リクエスト数の上限（要約・要点抽出を呼び出すスレッドプールが入れ子になっても、
+# 全インスタンス・全スレッド合計でconfig.llm_num_parallelを超えないようにする）
+_OLLAMA_SLOTS = threading.BoundedSemaphore(max(1, config.llm_num_parallel))
+
+
+def _compile_union(patterns: List[str], flags: int = 0) -> re.Pattern:
+    """
+    複数のパターンを1つの選択（|）にまとめてコンパイル
+    
+    パターンごとに文字列全体を走査し直さず、1回の走査で削除できるようにします。
+    
+    Args:
+        patterns: 正規表現パターンのリスト（先に書いたものが優先される）
+        flags: コンパイルフラグ
+        
+    Returns:
+        コンパイル済みの正規表現
+    """
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), flags)
+
+
+# 要約の後処理で削除する監査報告書関連の表現
+_AUDIT_RE = _compile_union([
+    r'本報告書は',
+    r'監査法人',
+    r'監査の目的と範囲',
+    r'監査の実施状況',
+    r'監査の結論',
+    r'重要な発見事項',
+    r'監査法人は',
+    r'監査人は',
+    r'期中レビュー',
+    r'要約中間連結財務諸表',
+    r'国際会計基準',
+    r'継続企業の前提',
+    r'財務諸表の作成',
+    r'適正に表示',
+    r'監査等委員会',
+    r'独立性',
+    r'職業倫理',
+    r'限定付結論',
+    r'否定的結論',
+    r'証拠に基づき',
+    r'2025年9月30日現在',
+    r'2025年4月1日から',
+    r'中間連結会計年度',
+    r'中間連結会計期間',
+], re.DOTALL | re.IGNORECASE)
+
+# 要約の後処理で削除する禁止注記
+_NOTICE_RE = _compile_union([
+    r'注:.*?本要約は.*?自動生成',
+    r'注:.*?AIによる',
+    r'正確な情報については.*?原本',
+    r'有価証券報告書の原本',
+], re.DOTALL | re.IGNORECASE)
+
+# 要約の後処理で削除するグラフのセクションタイトル・計算式
+_GRAPH_RE = _compile_union([
+    r'📈\s*[^\n]+',
+    r'簡易ROIC',
+    r'CF変換率',
+    r'営業利益/純資産',
+    r'営業CF/営業利益',
+], re.MULTILINE)
+
+# 監査関連の行を判定するキーワード（「監査法人」「監査人」は「監査」に含まれる）
+_AUDIT_KEYWORD_RE = re.compile('監査|財務諸表の作成|報告書の発表|会計基準|会計方針')
+
+# 要約プロンプト（本文より前の固定部分。本文はプロンプト末尾に連結する）
+_POLICY_PROMPT_PREFIX = """以下のテキストは有価証券報告書の「{section_name}」セクションです。以下の4項目について、具体的な数値を含めて要約してください。
+
+【文字数制限】レポート全体は800文字以上1,000文字以内で記述してください。
+
+①事業の概要・リスク
+事業概要、リスク要因、数値目標、財務指標、事業指標、M&A・投資計画について、具体的な数値（金額、比率、数量、年度など）を含めて記述してください。
+
+②経営成績・財政状態
+売上高、営業利益、純利益などの経営成績、および資産、負債、純資産などの財政状態に関する分析について、具体的な数値（金額、比率、数量など）を含めて記述してください。
+
+③キャッシュフロー状況
+営業キャッシュフロー、投資キャッシュフロー、フリーキャッシュフローの状況について、具体的な数値（金額、比率、数量など）を含めて記述してください。
+
+④配当政策
+配当政策、配当額・配当率、株主還元方針、自社株買い、配当の継続性・安定性について、具体的な数値（金額、比率、数量など）を含めて記述してください。
+
+【重要ルール】
+- 各項目には必ず具体的な数値を含めてください。数値が含まれていない項目は省略してください
+- 「高い」「良好」「安定」などの抽象的な表現のみの記述は禁止です
+- 会社を指す単語は「同社」を使用してください
+
+【テキスト】
+"""
+
+_MDA_PROMPT_PREFIX = """以下は有価証券報告書の「{section_name}」セクションです。投資判断に重要なポイントを3-5個の箇条書きで簡潔に要約してください。
+
+【出力要件】
+- 必ず日本語で出力してください
+- 各項目は50文字以内で記述してください
+- マークダウン記号（##、**、*など）は使用しないでください。平文で記述してください
+
+【テキスト】
+"""
+
+_PROMPT_SUFFIX = """
+
+上記のテキストを要約してください。"""
+
+# 生成トークン数の上限（経営方針・課題は800〜1,000文字、MD&Aは50文字以内×3〜5項目）
+_POLICY_NUM_PREDICT = 1500
+_MDA_NUM_PREDICT = 400
+
+# 受信を打ち切る生成文字数（後処理で削除される部分を見込み、1,000文字より多めに受信する）
+_MAX_RESPONSE_CHARS = 1500
+
+# 生成を打ち切る文字列（_TRAILING_NOTE_REで削除する末尾の注記・備考等の開始）
+_STOP_SEQUENCES = ("\n注記", "\n備考", "\nIII.", "\n要点まとめ")
+
+# Ollamaに指定するコンテキスト長（トークン数）
+_NUM_CTX = 8192
+
+# この文字数を超えるテキストは分割して要点を抽出してから要約する
+# （日本語はおおむね1文字1トークン以下のため、指示文（約500トークン）と生成分（_POLICY_NUM_PREDICT）を
+#   合わせても_NUM_CTXに収まる長さ。これ以下のテキストは1回のリクエストで要約する）
+_MAP_REDUCE_THRESHOLD = 6000
+# 分割後の1チャンクあたりの最大文字数
+_CHUNK_CHARS = 1800
+# チャンクごとの要点抽出で生成するトークン数の上限
+_CHUNK_NUM_PREDICT = 300
+
+# チャンクごとの要点抽出プロンプト（本文はプロンプト末尾に連結する）
+_CHUNK_PROMPT_PREFIX = """以下は有価証券報告書の「{section_name}」セクションの一部です。具体的な数値（金額、比率、数量、年度など）を含む重要な事実を、日本語の箇条書きで簡潔に抜き出してください。
+
+【テキスト】
+"""
+
+# システムプロンプト（経営方針・課題用、その他のセクション・分割テキストの要点抽出用）
+_POLICY_SYSTEM_PROMPT = "日本語のみで回答してください。文字数は800文字以上1,000文字以内で記述してください。"
+_DEFAULT_SYSTEM_PROMPT = "日本語のみで回答してください。"
+
+# 要約処理の版（下記の識別子に含まれない変更（後処理、temperatureなど）で要約結果が変わる場合は更新する）
+_PROMPT_VERSION = 1
+
+# 要約キャッシュのキーに含める、プロンプト・生成条件の識別子
+# （プロンプトや生成オプションを変更すると別のキーになり、変更前の要約は使われない）
+_PROMPT_FINGERPRINT = hashlib.sha256(repr((
+    _PROMPT_VERSION,
+    _POLICY_PROMPT_PREFIX,
+    _MDA_PROMPT_PREFIX,
+    _PROMPT_SUFFIX,
+    _CHUNK_PROMPT_PREFIX,
+    _POLICY_SYSTEM_PROMPT,
+    _DEFAULT_SYSTEM_PROMPT,
+    _POLICY_NUM_PREDICT,
+    _MDA_NUM_PREDICT,
+    _CHUNK_NUM_PREDICT,
+    _MAX_RESPONSE_CHARS,
+    _STOP_SEQUENCES,
+    _NUM_CTX,
+    _MAP_REDUCE_THRESHOLD,
+    _CHUNK_CHARS,
+)).encode("utf-8")).hexdigest()
+
+# 要約の整形に使う正規表現（行単位で適用）
+_TRAILING_NOTE_RE = re.compile(r'\s*(注記|備考|III\.|要点まとめ)')
+_ASTERISK_BULLET_RE = re.compile(r'\*\s+')
+
+
+def _split_into_chunks(text: str, max_chars: int) -> List[str]:
+    """
+    テキストを段落（空行）の区切りで、指定文字数以内のチャンクに分割
+    
+    Args:
+        text: 分割するテキスト
+        max_chars: 1チャンクあたりの最大文字数（これを超える段落は文字数で分割）
+        
+    Returns:
+        チャンクのリスト
+    """
+    chunks = []
+    current = []
+    current_len = 0
+    for paragraph in text.split('\n\n'):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        # 1段落で上限を超える場合は文字数で分割
+        pieces = [paragraph[i:i + max_chars] for i in range(0, len(paragraph), max_chars)]
+        for piece in pieces:
+            if current and current_len + len(piece) + 2 > max_chars:
+                chunks.append('\n\n'.join(current))
+                current = []
+                current_len = 0
+            current.append(piece)
+            current_len += len(piece) + 2
+    if current:
+        chunks.append('\n\n'.join(current))
+    return chunks
+
 
 class LLMSummarizer:
     """LLM要約クラス"""
@@ -34,11 +240,29 @@ class LLMSummarizer:
         self.model = model or config.llm_model
         self.timeout = timeout
         
-        # キャッシュディレクトリ（使用しない - pklに統合済み）
-        # cache_dir = Path(config.cache_dir)
-        # self.cache_dir = cache_dir / "edinet" / "summaries"
-        # self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.cache_dir = None  # ファイルキャッシュは使用しない（pklに統合）
+        # 要約キャッシュ（モデル・プロンプト・セクション名・本文が同じなら実行をまたいで再利用）
+        self.cache_dir = None
+        self.cache_db_path = None
+        if config.cache_enabled:
+            try:
+                self.cache_dir = Path(config.cache_dir) / "edinet"
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                self.cache_db_path = self.cache_dir / "summaries.sqlite"
+                with closing(sqlite3.connect(self.cache_db_path)) as conn, conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS summaries ("
+                        "key TEXT PRIMARY KEY, summary TEXT NOT NULL, created_at INTEGER NOT NULL)"
+                    )
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"要約キャッシュを初期化できませんでした: {e}")
+                self.cache_db_path = None
+        
+        # Ollamaクライアント（HTTP接続を呼び出し間で再利用）
+        # タイムアウトを指定し、応答のないリクエストが同時リクエスト数の枠（_OLLAMA_SLOTS）を保持し続けないようにする
+        self._client = ollama.Client(host=config.llm_host, timeout=self.timeout) if OLLAMA_AVAILABLE else None
+        # Ollamaの起動確認が成功したか（成功後は再確認しない）
+        self._ollama_ready = False
         
         if not OLLAMA_AVAILABLE:
             logger.warning("ollamaパッケージがインストールされていません。")
@@ -53,9 +277,14 @@ class LLMSummarizer:
         if not OLLAMA_AVAILABLE:
             return False
         
+        # 一度確認できれば、以降の要約ではヘルスチェックのリクエストを省略
+        if self._ollama_ready:
+            return True
+        
         try:
             # Ollamaのヘルスチェック（モデルリスト取得で確認）
-            ollama.list()
+            self._client.list()
+            self._ollama_ready = True
             return True
         except Exception as e:
             logger.warning(f"Ollamaが起動していません: {e}")
@@ -78,6 +307,59 @@ class LLMSummarizer:
         # ダミーパスを返す（実際には使用されない）
         return Path("/dev/null")
     
+    def _summary_cache_key(self, text: str, section_name: str) -> str:
+        """
+        要約キャッシュのキーを作成
+
+        Args:
+            text: 要約するテキスト
+            section_name: セクション名
+
+        Returns:
+            モデル名・プロンプトの識別子・セクション名・テキストのSHA-256ハッシュ
+        """
+        return hashlib.sha256(f"{self.model}|{_PROMPT_FINGERPRINT}|{section_name}|{text}".encode("utf-8")).hexdigest()
+    
+    def _load_cached_summary(self, key: str) -> Optional[str]:
+        """
+        要約キャッシュから要約を取得
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            キャッシュされた要約。存在しない場合はNone
+        """
+        if not self.cache_db_path:
+            return None
+        try:
+            with closing(sqlite3.connect(self.cache_db_path)) as conn, conn:
+                row = conn.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"要約キャッシュ読み込みエラー: {e}")
+            return None
+        return row[0] if row else None
+    
+    def _save_cached_summary(self, key: str, summary: str):
+        """
+        要約キャッシュに要約を保存
+
+        Args:
+            key: キャッシュキー
+            summary: 要約テキスト
+        """
+        if not self.cache_db_path:
+            return
+        try:
+            with closing(sqlite3.connect(self.cache_db_path)) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO summaries (key, summary, created_at) VALUES (?, ?, ?)",
+                    (key, summary, int(time.time()))
+                )
+        except sqlite3.Error as e:
+            # キャッシュ保存に失敗しても処理は続行
+            logger.warning(f"要約キャッシュ保存エラー: {e}")
+    
     def _post_process_summary(self, summary: str) -> str:
         """
         要約テキストの後処理
@@ -85,6 +367,7 @@ class LLMSummarizer:
         - 監査報告書の内容を削除
         - 禁止されている注記を削除
         - グラフのセクションタイトルや計算式を削除
+        - 最初の見出し行・①〜⑤の見出し行・末尾の注記等を削除し、マークダウン記法を統一
         - 文字数制限の適用
         
         Args:
@@ -93,94 +376,115 @@ class LLMSummarizer:
         Returns:
             後処理後の要約テキスト
         """
-        import re
-        
         # 1. 監査報告書の内容を積極的に削除
-        audit_patterns = [
-            r'本報告書は.*?',
-            r'監査法人.*?',
-            r'監査の目的と範囲.*?',
-            r'監査の実施状況.*?',
-            r'監査の結論.*?',
-            r'重要な発見事項.*?',
-            r'監査法人は.*?',
-            r'監査人は.*?',
-            r'期中レビュー.*?',
-            r'要約中間連結財務諸表.*?',
-            r'国際会計基準.*?',
-            r'継続企業の前提.*?',
-            r'財務諸表の作成.*?',
-            r'適正に表示.*?',
-            r'監査等委員会.*?',
-            r'独立性.*?',
-            r'職業倫理.*?',
-            r'限定付結論.*?',
-            r'否定的結論.*?',
-            r'証拠に基づき.*?',
-            r'2025年9月30日現在.*?',
-            r'2025年4月1日から.*?',
-            r'中間連結会計年度.*?',
-            r'中間連結会計期間.*?',
-        ]
-        
-        for pattern in audit_patterns:
-            summary = re.sub(pattern, '', summary, flags=re.DOTALL | re.IGNORECASE)
+        summary = _AUDIT_RE.sub('', summary)
         
         # 2. 禁止されている注記を削除
-        notice_patterns = [
-            r'注:.*?本要約は.*?自動生成.*?',
-            r'注:.*?AIによる.*?',
-            r'正確な情報については.*?原本.*?',
-            r'有価証券報告書の原本.*?',
-        ]
-        
-        for pattern in notice_patterns:
-            summary = re.sub(pattern, '', summary, flags=re.DOTALL | re.IGNORECASE)
+        summary = _NOTICE_RE.sub('', summary)
         
         # 3. グラフのセクションタイトルや計算式を削除
-        graph_patterns = [
-            r'📈\s*[^\n]+',
-            r'簡易ROIC.*?',
-            r'CF変換率.*?',
-            r'営業利益/純資産.*?',
-            r'営業CF/営業利益.*?',
-        ]
+        summary = _GRAPH_RE.sub('', summary)
         
-        for pattern in graph_patterns:
-            summary = re.sub(pattern, '', summary, flags=re.MULTILINE)
-        
-        # 4. 監査関連の単語が含まれる行を削除
-        lines = summary.split('\n')
-        filtered_lines = []
-        for line in lines:
-            # 監査関連のキーワードが含まれている行をスキップ
-            if any(keyword in line for keyword in ['監査', '監査法人', '監査人', '財務諸表の作成', '報告書の発表', '会計基準', '会計方針']):
+        # 4. 行単位の整形（行のリストのまま1回の走査で処理し、最後に1度だけ結合）
+        kept_lines = []
+        skip_first_heading = True
+        seen_text = False
+        reached_trailing_note = False
+        for line in summary.split('\n'):
+            # 監査関連の単語が含まれる行を削除
+            if _AUDIT_KEYWORD_RE.search(line):
                 continue
-            filtered_lines.append(line)
-        summary = '\n'.join(filtered_lines)
-        
-        # 5. 余分な空白を整理
-        summary = re.sub(r'\n{3,}', '\n\n', summary)
-        summary = summary.strip()
+            stripped = line.strip()
+            # 先頭の空行は出力しない
+            if not stripped and not seen_text:
+                continue
+            seen_text = True
+            # 最初の##見出しをスキップ（タイトル行を削除）
+            if skip_first_heading and stripped.startswith('##'):
+                skip_first_heading = False
+                continue
+            # 見出し行（①、②で始まる行）をスキップ（マークダウン見出しに置き換える）
+            if stripped and stripped[0] in '①②③④⑤':
+                continue
+            # <br>タグを改行に変換
+            for sub_line in line.replace('<br>', '\n').replace('<br/>', '\n').replace('<br />', '\n').split('\n'):
+                # 「注記」「備考」「III.」「要点まとめ」で始まる行以降を削除
+                if kept_lines and _TRAILING_NOTE_RE.match(sub_line):
+                    reached_trailing_note = True
+                    break
+                # *で始まる箇条書きを-に統一（マークダウン記法の統一）
+                bullet = _ASTERISK_BULLET_RE.match(sub_line)
+                if bullet:
+                    sub_line = '- ' + sub_line[bullet.end():]
+                # 連続する空行は1行にまとめる
+                if not sub_line and kept_lines and not kept_lines[-1]:
+                    continue
+                kept_lines.append(sub_line)
+            if reached_trailing_note:
+                break
+        summary = '\n'.join(kept_lines).strip()
         
-        # 6. 文字数制限の適用（1,000文字を超える場合は切り詰め）
+        # 5. 文字数制限の適用（1,000文字を超える場合は、1,000文字以内の最後の文末または行末で切り詰め）
         if len(summary) > 1000:
-            # 1,000文字以内になるように、文単位で切り詰め
-            sentences = re.split(r'[。\n]', summary)
-            truncated = []
-            current_length = 0
-            for sentence in sentences:
-                if current_length + len(sentence) + 1 <= 1000:
-                    truncated.append(sentence)
-                    current_length += len(sentence) + 1
-                else:
-                    break
-            summary = '。'.join(truncated)
-            if summary and not summary.endswith('。'):
-                summary += '。'
+            cut = max(summary.rfind('。', 0, 1000) + 1, summary.rfind('\n', 0, 1001))
+            summary = summary[:cut if cut > 0 else 1000].rstrip()
         
         return summary
     
+    def _summarize_chunk(self, chunk: str, section_name: str) -> str:
+        """
+        分割したテキストの一部から要点を抽出
+
+        Args:
+            chunk: 分割したテキスト
+            section_name: セクション名（プロンプトに使用）
+
+        Returns:
+            抽出した要点（エラー時は空文字列）
+        """
+        try:
+            # Ollamaへの同時リクエスト数を制限
+            with _OLLAMA_SLOTS:
+                response = self._client.generate(
+                    model=self.model,
+                    prompt=_CHUNK_PROMPT_PREFIX.format(section_name=section_name) + chunk,
+                    system=_DEFAULT_SYSTEM_PROMPT,
+                    options={
+                        "temperature": 0.3,
+                        "num_predict": _CHUNK_NUM_PREDICT,
+                        "top_p": 0.9,
+                        "num_ctx": _NUM_CTX,  # 要約と同じ値にする（異なるとOllamaがモデルを再読み込みする）
+                    }
+                )
+            return response.get("response", "").strip()
+        except Exception as e:
+            logger.warning(f"分割テキストの要点抽出エラー: {section_name} - {e}")
+            return ""
+    
+    def _condense_text(self, text: str, section_name: str) -> str:
+        """
+        長いテキストを分割し、各部分の要点を並列に抽出して結合（map-reduceのmap段階）
+        
+        Ollamaへの同時リクエスト数は_OLLAMA_SLOTSで制限されるため、年度ごとのスレッドプールから
+        呼び出されても合計でconfig.llm_num_parallelを超えません。
+
+        Args:
+            text: 要約するテキスト
+            section_name: セクション名（プロンプトに使用）
+
+        Returns:
+            各部分の要点を結合したテキスト（要点を抽出できなかった場合は元のテキスト）
+        """
+        chunks = _split_into_chunks(text, _CHUNK_CHARS)
+        logger.info(f"長いテキストを分割して要点を抽出: {section_name} ({len(text)}文字, {len(chunks)}分割)")
+        
+        max_workers = max(1, min(config.llm_num_parallel, len(chunks)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            partials = list(executor.map(lambda chunk: self._summarize_chunk(chunk, section_name), chunks))
+        
+        condensed = '\n\n'.join(partial for partial in partials if partial)
+        return condensed or text
+    
     def summarize_text(
         self,
         text: str,
@@ -203,140 +507,94 @@ class LLMSummarizer:
         if not text or not text.strip():
             return "要約対象のテキストがありません。"
         
-        # キャッシュチェック（ファイルキャッシュは使用しない - pklに統合済み）
-        # キャッシュはindividual.pyのedinet_dataのmanagement_policyに保存されているため、
-        # ここではファイルキャッシュをチェックしない
-        # if use_cache and doc_id:
-        #     cache_path = self._get_cache_path(doc_id, section_name)
-        #     if cache_path.exists():
-        #         try:
-        #             with open(cache_path, "r", encoding="utf-8") as f:
-        #                 cached_summary = f.read()
-        #             logger.debug(f"キャッシュから要約を取得: {doc_id} {section_name}")
-        #             return cached_summary
-        #         except Exception as e:
-        #             logger.warning(f"キャッシュ読み込みエラー: {e}")
+        # キャッシュチェック（同じモデル・プロンプト・セクション・本文の要約は再生成しない）
+        cache_key = self._summary_cache_key(text, section_name) if use_cache else None
+        if cache_key:
+            cached_summary = self._load_cached_summary(cache_key)
+            if cached_summary is not None:
+                logger.debug(f"キャッシュから要約を取得: {doc_id} {section_name}")
+                return cached_summary
         
         # Ollamaが利用可能かチェック
         if not self._check_ollama_available():
             logger.warning("Ollamaが起動していないため、要約をスキップします。")
             return "要約生成不可（Ollama未起動）"
         
+        # 長いテキストは分割して要点を抽出し、抽出結果を本文として要約する（map-reduce）
+        if len(text) > _MAP_REDUCE_THRESHOLD:
+            text = self._condense_text(text, section_name)
+        
         # プロンプト作成（セクション名に応じてプロンプトを変更）
         # MD&Aも含めてマークダウン記号を削除するため、すべてのセクションで処理
+        # 固定の指示文を先頭に、本文を末尾に置く（Ollama側でプロンプト先頭のKVキャッシュを再利用できる）
         if "経営方針" in section_name or "課題" in section_name:
             # 経営方針・課題セクション用のプロンプト
-            prompt = f"""以下のテキストは有価証券報告書の「{section_name}」セクションです。以下の4項目について、具体的な数値を含めて要約してください。
-
-【文字数制限】レポート全体は800文字以上1,000文字以内で記述してください。
-
-①事業の概要・リスク
-事業概要、リスク要因、数値目標、財務指標、事業指標、M&A・投資計画について、具体的な数値（金額、比率、数量、年度など）を含めて記述してください。
-
-②経営成績・財政状態
-売上高、営業利益、純利益などの経営成績、および資産、負債、純資産などの財政状態に関する分析について、具体的な数値（金額、比率、数量など）を含めて記述してください。
-
-③キャッシュフロー状況
-営業キャッシュフロー、投資キャッシュフロー、フリーキャッシュフローの状況について、具体的な数値（金額、比率、数量など）を含めて記述してください。
-
-④配当政策
-配当政策、配当額・配当率、株主還元方針、自社株買い、配当の継続性・安定性について、具体的な数値（金額、比率、数量など）を含めて記述してください。
-
-【重要ルール】
-- 各項目には必ず具体的な数値を含めてください。数値が含まれていない項目は省略してください
-- 「高い」「良好」「安定」などの抽象的な表現のみの記述は禁止です
-- 会社を指す単語は「同社」を使用してください
-
-【テキスト】
-{text}
-
-上記のテキストを要約してください。"""
+            prompt_prefix = _POLICY_PROMPT_PREFIX
         else:
             # その他のセクション用のプロンプト（MD&Aなど）
-            prompt = f"""以下は有価証券報告書の「{section_name}」セクションです。投資判断に重要なポイントを3-5個の箇条書きで簡潔に要約してください。
-
-【出力要件】
-- 必ず日本語で出力してください
-- 各項目は50文字以内で記述してください
-- マークダウン記号（##、**、*など）は使用しないでください。平文で記述してください
-
-【テキスト】
-{text}
-
-上記のテキストを要約してください。"""
+            prompt_prefix = _MDA_PROMPT_PREFIX
+        prompt = prompt_prefix.format(section_name=section_name) + text + _PROMPT_SUFFIX
         
         try:
             # Ollamaで要約生成
             # 日本語出力を確実にするため、システムプロンプトも追加
             if "経営方針" in section_name or "課題" in section_name:
-                system_prompt = "日本語のみで回答してください。文字数は800文字以上1,000文字以内で記述してください。"
+                system_prompt = _POLICY_SYSTEM_PROMPT
+                num_predict = _POLICY_NUM_PREDICT
             else:
-                system_prompt = "日本語のみで回答してください。"
+                system_prompt = _DEFAULT_SYSTEM_PROMPT
+                num_predict = _MDA_NUM_PREDICT
             
-            response = ollama.generate(
-                model=self.model,
-                prompt=prompt,
-                system=system_prompt,  # システムプロンプトで言語を指定（日本語で記述）
-                options={
-                    "temperature": 0.3,  # 温度を少し上げて創造性を向上
-                    "num_predict": 3000,  # 最大3000トークン（800〜1,000文字のレポート生成に必要、余裕を持たせる）
-                    "top_p": 0.9,  # top_pを設定して出力を安定化
-                }
-            )
+            # Ollamaへの同時リクエスト数を制限（受信を終えるまで枠を保持）
+            with _OLLAMA_SLOTS:
+                stream = self._client.generate(
+                    model=self.model,
+                    prompt=prompt,
+                    system=system_prompt,  # システムプロンプトで言語を指定（日本語で記述）
+                    options={
+                        "temperature": 0.3,  # 温度を少し上げて創造性を向上
+                        "num_predict": num_predict,  # 後処理で1,000文字に切り詰めるため、それを超える分は生成しない
+                        "top_p": 0.9,  # top_pを設定して出力を安定化
+                        "stop": list(_STOP_SEQUENCES),  # 後処理で削除する末尾の注記等に達したら生成を終了
+                        "num_ctx": _NUM_CTX,  # 分割しない長さの本文を切り捨てずに受け付ける
+                    },
+                    stream=True
+                )
+                
+                # ストリーミングで受信し、後処理で切り詰められる長さに達したら受信を打ち切る
+                parts = []
+                received_chars = 0
+                try:
+                    for chunk in stream:
+                        part = chunk.get("response", "")
+                        parts.append(part)
+                        received_chars += len(part)
+                        if received_chars > _MAX_RESPONSE_CHARS:
+                            logger.debug(f"生成文字数が上限に達したため受信を打ち切ります: {section_name} ({received_chars}文字)")
+                            break
+                finally:
+                    # 接続を閉じてOllama側の生成も終了させる
+                    close = getattr(stream, "close", None)
+                    if close:
+                        close()
             
-            summary = response.get("response", "").strip()
+            summary = "".join(parts).strip()
             
             if not summary:
                 summary = "要約生成不可（レスポンスが空）"
             else:
-                # 後処理：不要な内容を削除
+                # 後処理：不要な内容を削除（マークダウン記法を保持しつつ、見出し行や注記等も削除）
                 summary = self._post_process_summary(summary)
-                
-                # マークダウン記法を保持しつつ、不要な部分を削除
-                import re
-                # 最初の見出し行（タイトル行）を削除
-                lines = summary.split('\n')
-                filtered_lines = []
-                skip_first_heading = True
-                for line in lines:
-                    stripped = line.strip()
-                    # 最初の##見出しをスキップ（タイトル行を削除）
-                    if skip_first_heading and stripped.startswith('##'):
-                        skip_first_heading = False
-                        continue
-                    # 見出し行（①、②で始まる行）をスキップ（マークダウン見出しに置き換える）
-                    if stripped and stripped[0] in '①②③④⑤':
-                        continue
-                    # <br>タグを改行に変換
-                    line = line.replace('<br>', '\n').replace('<br/>', '\n').replace('<br />', '\n')
-                    filtered_lines.append(line)
-                summary = '\n'.join(filtered_lines)
-                
-                # 「注記：」「備考：」「III.」「要点まとめ」で始まる行以降を削除
-                summary = re.sub(r'\n\s*(注記|備考|III\.|要点まとめ).*$', '', summary, flags=re.MULTILINE | re.DOTALL)
-                
-                # *で始まる箇条書きを-に統一（マークダウン記法の統一）
-                summary = re.sub(r'^\*\s+', '- ', summary, flags=re.MULTILINE)
-                
-                # 余分な空行を整理（3行以上連続する空行を2行に）
-                summary = re.sub(r'\n{3,}', '\n\n', summary)
-                summary = summary.strip()
             
-            # キャッシュに保存（ファイルキャッシュは使用しない - pklに統合済み）
-            # キャッシュはindividual.pyのedinet_dataのmanagement_policyに保存されるため、
-            # ここではファイルキャッシュに保存しない
-            # if use_cache and doc_id and summary != "要約生成不可（レスポンスが空）":
-            #     try:
-            #         cache_path = self._get_cache_path(doc_id, section_name)
-            #         with open(cache_path, "w", encoding="utf-8") as f:
-            #             f.write(summary)
-            #     except Exception as e:
-            #         logger.warning(f"キャッシュ保存エラー: {e}")
+            # キャッシュに保存（生成できなかった場合は保存しない）
+            if cache_key and summary != "要約生成不可（レスポンスが空）":
+                self._save_cached_summary(cache_key, summary)
             
             logger.info(f"要約生成完了: {section_name} ({len(summary)}文字)")
             return summary
         
         except Exception as e:
             logger.error(f"LLM要約エラー: {section_name} - {e}")
+            # Ollamaが停止した可能性があるため、次回は起動確認からやり直す
+            self._ollama_ready = False
             return "要約生成不可（エラー発生）"
-
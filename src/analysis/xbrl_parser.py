@@ -5,18 +5,22 @@ XBRL解析モジュール
 XBRLインスタンス文書（XML形式）からテキストブロックを抽出します。
 """
 
+import hashlib
 import logging
+import pickle
 import re
 import html
+import unicodedata
+from functools import lru_cache
 from typing import Optional, Dict, List
 from pathlib import Path
 
 try:
-    from bs4 import BeautifulSoup
-    BS4_AVAILABLE = True
+    from lxml import etree
+    LXML_AVAILABLE = True
 except ImportError:
-    BS4_AVAILABLE = False
-    logging.warning("beautifulsoup4がインストールされていません。XBRL解析機能は使用できません。")
+    LXML_AVAILABLE = False
+    logging.warning("lxmlがインストールされていません。インラインXBRL解析機能は使用できません。")
 
 try:
     import xml.etree.ElementTree as ET
@@ -25,8 +29,84 @@ except ImportError:
     ET_AVAILABLE = False
     logging.warning("xml.etree.ElementTreeが利用できません。XBRL解析機能は使用できません。")
 
+from ..config import config
+
 logger = logging.getLogger(__name__)
 
+# 見出しタグ
+_HEADING_TAGS = frozenset(("h1", "h2", "h3", "h4", "h5", "h6"))
+
+# インラインXBRL（HTML）のストリーミング解析時の読み込み単位（バイト）
+_HTML_CHUNK_SIZE = 64 * 1024
+
+# テキストブロックのディスクキャッシュの形式バージョン
+# （_parse_text_blocks・_extract_text_from_html_element_simpleの抽出結果が変わる変更をした場合は更新し、古いキャッシュを無効化する）
+_TEXT_BLOCKS_CACHE_VERSION = 1
+
+# extract_sectionで抽出するセクションの最大文字数
+_MAX_SECTION_CHARS = 10000
+
+# 空白（全角空白・改行を含む）
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# _normalize_textで改行を挿入する見出しパターン
+# （数字）見出し
+_PAREN_HEADING_RE = re.compile(r'（([０-９0-9]+)）([^）\n]+)')
+# 数字【見出し】
+_NUMBERED_BRACKET_HEADING_RE = re.compile(r'([０-９0-9]+)【([^】]+)】')
+# 【見出し】
+_BRACKET_HEADING_RE = re.compile(r'【([^】]+)】')
+# 注数字．見出し
+_NOTE_HEADING_RE = re.compile(r'注([０-９0-9]+)\.')
+# 3行以上連続する改行
+_EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+
+# HTMLタグ
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+
+@lru_cache(maxsize=64)
+def _compile_literals(patterns: tuple) -> re.Pattern:
+    """
+    文字列パターン（正規表現ではない）のいずれかに一致する正規表現をコンパイル
+    
+    Args:
+        patterns: 検索する文字列のタプル
+        
+    Returns:
+        コンパイル済みの正規表現
+    """
+    return re.compile('|'.join(re.escape(pattern) for pattern in patterns))
+
+
+def _normalize_for_match(text: str) -> str:
+    """
+    タイトル照合用にテキストを正規化（NFKC正規化し、空白を除去）
+    
+    全角・半角の表記ゆれや見出し内の空白・改行があっても一致するようにします。
+    
+    Args:
+        text: 正規化するテキスト
+        
+    Returns:
+        正規化後のテキスト
+    """
+    return _WHITESPACE_RE.sub("", unicodedata.normalize("NFKC", text))
+
+
+@lru_cache(maxsize=32)
+def _title_needle(section_title: str) -> str:
+    """
+    セクションタイトルを照合用に正規化（同じタイトルの正規化結果を再利用）
+    
+    Args:
+        section_title: セクションタイトル
+        
+    Returns:
+        正規化後のタイトル
+    """
+    return _normalize_for_match(section_title)
+
 
 class XBRLParser:
     """XBRL解析クラス"""
@@ -67,71 +147,83 @@ class XBRLParser:
     
     def __init__(self):
         """初期化"""
-        if not BS4_AVAILABLE:
-            logger.warning("beautifulsoup4がインストールされていません。")
+        if not LXML_AVAILABLE:
+            logger.warning("lxmlがインストールされていません。")
     
-    def _find_section(self, soup: BeautifulSoup, section_title: str) -> Optional[str]:
+    def _find_section(self, html_file: Path, section_title: str) -> Optional[str]:
         """
-        セクションを検索してテキストを抽出
+        インラインXBRL（HTML）をストリーミング解析してセクションテキストを抽出
+        
+        見出しでセクションが見つかった時点でファイルの読み込みを打ち切ります。
 
         Args:
-            soup: BeautifulSoupオブジェクト
-            section_title: セクションタイトル（部分一致）
+            html_file: HTMLファイルのパス
+            section_title: セクションタイトル（部分一致、全角・半角や空白の違いは無視）
 
         Returns:
             セクションテキスト（見つからない場合はNone）
         """
-        if not BS4_AVAILABLE:
-            return None
-        
-        # セクションタイトルを含む要素を検索
-        # 有価証券報告書の構造に応じて検索パターンを調整
-        
-        # パターン1: 見出しタグ（h1-h6）で検索
-        headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-        for heading in headings:
-            if section_title in heading.get_text():
-                # 次の見出しまでを取得
-                content = []
-                current = heading.next_sibling
-                while current:
-                    # 次の見出しが見つかったら終了
-                    # currentがTagオブジェクトの場合のみname属性にアクセス
-                    try:
-                        # BeautifulSoupのTagオブジェクトの場合
-                        if hasattr(current, 'name') and hasattr(current, 'get_text'):
-                            if getattr(current, 'name', None) in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                                break
-                            text = current.get_text(strip=True)
+        needle = _title_needle(section_title)
+        parser = etree.HTMLPullParser(events=("start", "end"), encoding="utf-8")
+        heading = None
+        parent = None
+        last_sibling = None
+        content = []
+        
+        with open(html_file, "rb") as f:
+            while True:
+                chunk = f.read(_HTML_CHUNK_SIZE)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+                
+                for event, elem in parser.read_events():
+                    # パターン1: 見出しタグ（h1-h6）で検索
+                    if heading is None:
+                        if event == "end" and elem.tag in _HEADING_TAGS and needle in _normalize_for_match("".join(elem.itertext())):
+                            heading = elem
+                            parent = elem.getparent()
+                            last_sibling = elem
+                            content = []
+                        continue
+                    
+                    # 次の見出しまでの兄弟要素（要素間のテキストを含む）を取得
+                    finished = False
+                    if elem is parent and event == "end":
+                        finished = True
+                    elif elem.getparent() is parent:
+                        if event == "start":
+                            text = (last_sibling.tail or "").strip()
                             if text:
                                 content.append(text)
-                        elif isinstance(current, str):
-                            text = current.strip()
+                            # 次の見出しが見つかったら終了
+                            if elem.tag in _HEADING_TAGS:
+                                heading = None
+                                if content:
+                                    return "\n".join(content)
+                        else:
+                            text = "".join(s.strip() for s in elem.itertext())
                             if text:
                                 content.append(text)
-                    except (AttributeError, TypeError):
-                        # 属性アクセスエラーの場合はスキップ
-                        pass
+                            last_sibling = elem
                     
-                    # next_siblingが存在する場合のみ取得（NavigableStringやTagオブジェクトの場合）
-                    try:
-                        if hasattr(current, 'next_sibling'):
-                            current = current.next_sibling  # type: ignore
-                        else:
-                            break
-                    except (AttributeError, TypeError):
-                        break
-                
-                if content:
-                    return "\n".join(content)
+                    if finished:
+                        text = (last_sibling.tail or "").strip()
+                        if text:
+                            content.append(text)
+                        if content:
+                            return "\n".join(content)
+                        heading = None
+        
+        root = parser.close()
+        if heading is not None and content:
+            return "\n".join(content)
         
         # パターン2: divやpタグ内で検索
-        elements = soup.find_all(['div', 'p', 'section'])
-        for elem in elements:
-            text = elem.get_text()
-            if section_title in text:
+        for elem in root.iter("div", "p", "section"):
+            if needle in _normalize_for_match("".join(elem.itertext())):
                 # セクションタイトルを含む要素のテキストを取得
-                return elem.get_text(separator="\n", strip=True)
+                return "\n".join(s.strip() for s in elem.itertext() if s.strip())
         
         return None
     
@@ -150,8 +242,8 @@ class XBRLParser:
         Returns:
             セクションテキスト（見つからない場合はNone）
         """
-        if not BS4_AVAILABLE:
-            logger.warning("beautifulsoup4がインストールされていないため、XBRL解析をスキップします。")
+        if not LXML_AVAILABLE:
+            logger.warning("lxmlがインストールされていないため、XBRL解析をスキップします。")
             return None
         
         if not xbrl_dir.exists() or not xbrl_dir.is_dir():
@@ -175,29 +267,27 @@ class XBRLParser:
         html_file = html_files[0]
         
         try:
-            with open(html_file, "r", encoding="utf-8") as f:
-                content = f.read()
-            
-            soup = BeautifulSoup(content, "lxml")
-            
-            # セクションを検索
-            section_text = self._find_section(soup, section_name)
+            # セクションを検索（見出しが見つかった時点で解析を打ち切る）
+            section_text = self._find_section(html_file, section_name)
             
             if section_text:
                 # テキスト整形
                 # HTMLタグ除去、余分な空白・改行削除
-                lines = section_text.split("\n")
+                # 長すぎる場合は切り詰め（10,000文字まで）
+                # （上限を超えた時点で以降の行は整形しない）
                 cleaned_lines = []
-                for line in lines:
+                length = -1
+                for line in section_text.split("\n"):
                     line = line.strip()
                     if line:
                         cleaned_lines.append(line)
+                        length += len(line) + 1
+                        if length > _MAX_SECTION_CHARS:
+                            break
                 
                 result = "\n".join(cleaned_lines)
-                
-                # 長すぎる場合は切り詰め（10,000文字まで）
-                if len(result) > 10000:
-                    result = result[:10000] + "..."
+                if len(result) > _MAX_SECTION_CHARS:
+                    result = result[:_MAX_SECTION_CHARS] + "..."
                 
                 logger.info(f"セクション抽出成功: {section_name} ({len(result)}文字)")
                 return result
@@ -250,14 +340,7 @@ class XBRLParser:
             'annual' (有価証券報告書) または 'interim' (半期報告書)
         """
         # XBRLインスタンス文書を検索
-        xml_files = []
-        for xml_file in xbrl_dir.rglob("*.xml"):
-            if any(suffix in xml_file.name for suffix in ['_lab.xml', '_pre.xml', '_cal.xml', '_def.xml']):
-                continue
-            xml_files.append(xml_file)
-        
-        xbrl_files = list(xbrl_dir.rglob("*.xbrl"))
-        xml_files.extend(xbrl_files)
+        xml_files = self._instance_files(xbrl_dir)
         
         # ファイル名から判定
         for xml_file in xml_files:
@@ -272,11 +355,9 @@ class XBRLParser:
         # XMLファイルの内容から判定
         for xml_file in xml_files[:5]:  # 最初の5ファイルをチェック
             try:
-                tree = ET.parse(xml_file)
-                root = tree.getroot()
-                
                 # DocumentType要素を検索
-                for elem in root.iter():
+                # （文書全体のツリーを作らず、判定できた時点で読み込みを打ち切る）
+                for _, elem in ET.iterparse(xml_file, events=("end",)):
                     tag = elem.tag
                     if '}' in tag:
                         tag = tag.split('}')[1]
@@ -289,6 +370,8 @@ class XBRLParser:
                                 return 'annual'
                             if '半期報告書' in text or 'interim' in text_lower or 'quarterly' in text_lower or '030300' in text:
                                 return 'interim'
+                    
+                    elem.clear()
             except Exception:
                 continue
         
@@ -296,6 +379,140 @@ class XBRLParser:
         logger.warning(f"報告書タイプを判定できませんでした。デフォルトで有価証券報告書として処理します: {xbrl_dir}")
         return 'annual'
     
+    def _instance_files(self, xbrl_dir: Path) -> List[Path]:
+        """
+        XBRLインスタンス文書を検索
+        
+        Args:
+            xbrl_dir: XBRL展開ディレクトリのパス
+            
+        Returns:
+            XBRLインスタンス文書のパスのリスト（*.xml（リンクベースを除く）、*.xbrlの順）
+        """
+        xml_files = [
+            xml_file for xml_file in xbrl_dir.rglob("*.xml")
+            if not any(suffix in xml_file.name for suffix in ['_lab.xml', '_pre.xml', '_cal.xml', '_def.xml'])
+        ]
+        xml_files.extend(xbrl_dir.rglob("*.xbrl"))
+        return xml_files
+    
+    def _load_all_text_blocks(self, xml_files: List[Path]) -> Dict[str, str]:
+        """
+        XBRL展開ディレクトリ内の全インスタンス文書のテキストブロックを取得
+        
+        ファイルごとの抽出結果は_load_text_blocksのディスクキャッシュから再利用します。
+        
+        Args:
+            xml_files: XBRLインスタンス文書のパスのリスト
+            
+        Returns:
+            {要素名（名前空間なし）: テキスト} の辞書
+        """
+        # 全てのテキストブロック要素を抽出（要素名ベース）
+        all_text_blocks = {}
+        
+        for xml_file in xml_files:
+            try:
+                all_text_blocks.update(self._load_text_blocks(xml_file))
+            except ET.ParseError as e:
+                logger.warning(f"XMLパースエラー: {xml_file.name} - {e}")
+                continue
+            except Exception as e:
+                logger.error(f"XBRLテキスト抽出エラー: {xml_file.name} - {e}", exc_info=True)
+                continue
+        
+        return all_text_blocks
+    
+    def _parse_text_blocks(self, xml_file: Path) -> Dict[str, str]:
+        """
+        XBRLインスタンス文書からテキストブロック要素を抽出
+        
+        Args:
+            xml_file: XBRLインスタンス文書のパス
+            
+        Returns:
+            {要素名（名前空間なし）: テキスト} の辞書
+            
+        Raises:
+            ET.ParseError: XMLとしてパースできない場合
+        """
+        text_blocks = {}
+        # 開いているテキストブロック要素の深さ（内側の要素は外側の抽出が終わるまで解放しない）
+        open_blocks = 0
+        
+        # 文書全体のツリーを保持しないよう、要素の終了ごとに処理して解放する
+        for event, elem in ET.iterparse(xml_file, events=("start", "end")):
+            tag = elem.tag
+            # 名前空間を除去
+            if '}' in tag:
+                local_tag = tag.split('}')[1]
+            else:
+                local_tag = tag
+            
+            # TextBlockで終わる要素を検索
+            is_text_block = local_tag.endswith('TextBlock') or 'TextBlock' in local_tag
+            if event == "start":
+                if is_text_block:
+                    open_blocks += 1
+                continue
+            
+            if is_text_block:
+                open_blocks -= 1
+                # 要素のテキストを取得
+                text = self._extract_text_from_html_element_simple(elem)
+                if text and len(text) > 50:
+                    # 要素名をキーとして保存
+                    text_blocks[local_tag] = text
+            
+            if open_blocks == 0:
+                elem.clear()
+        
+        return text_blocks
+    
+    def _load_text_blocks(self, xml_file: Path) -> Dict[str, str]:
+        """
+        XBRLインスタンス文書のテキストブロックを取得（ディスクキャッシュ付き）
+        
+        ファイルの更新日時とサイズ、抽出処理のバージョン（_TEXT_BLOCKS_CACHE_VERSION）が変わっていなければ、
+        前回の抽出結果をキャッシュから返します。
+        
+        Args:
+            xml_file: XBRLインスタンス文書のパス
+            
+        Returns:
+            {要素名（名前空間なし）: テキスト} の辞書
+            
+        Raises:
+            ET.ParseError: XMLとしてパースできない場合
+        """
+        if not config.cache_enabled:
+            return self._parse_text_blocks(xml_file)
+        
+        stat = xml_file.stat()
+        file_key = (_TEXT_BLOCKS_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+        cache_dir = Path(config.cache_dir) / "xbrl_text"
+        cache_path = cache_dir / f"{hashlib.sha1(str(xml_file.resolve()).encode('utf-8')).hexdigest()}.pkl"
+        
+        try:
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+            if cached.get("file_key") == file_key:
+                return cached["text_blocks"]
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError):
+            pass
+        
+        text_blocks = self._parse_text_blocks(xml_file)
+        
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, "wb") as f:
+                pickle.dump({"file_key": file_key, "text_blocks": text_blocks}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (OSError, pickle.PicklingError) as e:
+            # キャッシュ保存に失敗しても処理は続行
+            logger.warning(f"XBRLテキストキャッシュ保存エラー: {xml_file.name} - {e}")
+        
+        return text_blocks
+    
     def extract_sections_by_type(
         self, 
         xbrl_dir: Path, 
@@ -324,60 +541,14 @@ class XBRLParser:
         logger.info(f"抽出対象セクション数: {len(sections)}")
         
         # XBRLインスタンス文書を検索
-        xml_files = []
-        for xml_file in xbrl_dir.rglob("*.xml"):
-            if any(suffix in xml_file.name for suffix in ['_lab.xml', '_pre.xml', '_cal.xml', '_def.xml']):
-                continue
-            xml_files.append(xml_file)
-        
-        xbrl_files = list(xbrl_dir.rglob("*.xbrl"))
-        xml_files.extend(xbrl_files)
+        xml_files = self._instance_files(xbrl_dir)
         
         if not xml_files:
             logger.warning(f"XBRLインスタンス文書が見つかりません: {xbrl_dir}")
             return {}
         
-        # 全てのテキストブロック要素を抽出（要素名ベース）
-        all_text_blocks = {}
-        namespaces = {}
-        
-        for xml_file in xml_files:
-            try:
-                tree = ET.parse(xml_file)
-                root = tree.getroot()
-                
-                # 名前空間を登録
-                for prefix, uri in root.attrib.items():
-                    if prefix.startswith('xmlns'):
-                        if prefix == 'xmlns':
-                            namespaces[''] = uri
-                        else:
-                            ns_prefix = prefix.replace('xmlns:', '')
-                            namespaces[ns_prefix] = uri
-                
-                # 全ての要素を走査してテキストブロックを検索
-                for elem in root.iter():
-                    tag = elem.tag
-                    # 名前空間を除去
-                    if '}' in tag:
-                        local_tag = tag.split('}')[1]
-                    else:
-                        local_tag = tag
-                    
-                    # TextBlockで終わる要素を検索
-                    if local_tag.endswith('TextBlock') or 'TextBlock' in local_tag:
-                        # 要素のテキストを取得
-                        text = self._extract_text_from_html_element_simple(elem)
-                        if text and len(text) > 50:
-                            # 要素名をキーとして保存
-                            all_text_blocks[local_tag] = text
-                            
-            except ET.ParseError as e:
-                logger.warning(f"XMLパースエラー: {xml_file.name} - {e}")
-                continue
-            except Exception as e:
-                logger.error(f"XBRLテキスト抽出エラー: {xml_file.name} - {e}", exc_info=True)
-                continue
+        # 全てのテキストブロック要素を抽出（要素名ベース、同じディレクトリの結果は再利用）
+        all_text_blocks = self._load_all_text_blocks(xml_files)
         
         # セクション定義に基づいて抽出
         result = {}
@@ -592,16 +763,16 @@ class XBRLParser:
         """
         # 見出しパターンの前に改行を挿入
         # パターン1: （数字）見出し
-        text = re.sub(r'（([０-９0-9]+)）([^）\n]+)', r'\n（\1）\2', text)
+        text = _PAREN_HEADING_RE.sub(r'\n（\1）\2', text)
         # パターン2: 数字【見出し】
-        text = re.sub(r'([０-９0-9]+)【([^】]+)】', r'\n\1【\2】', text)
+        text = _NUMBERED_BRACKET_HEADING_RE.sub(r'\n\1【\2】', text)
         # パターン3: 【見出し】
-        text = re.sub(r'【([^】]+)】', r'\n【\1】', text)
+        text = _BRACKET_HEADING_RE.sub(r'\n【\1】', text)
         # パターン4: 注数字．見出し
-        text = re.sub(r'注([０-９0-9]+)\.', r'\n注\1.', text)
+        text = _NOTE_HEADING_RE.sub(r'\n注\1.', text)
         
         # 余分な改行を整理（3行以上連続する改行を2行に）
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _EXCESS_NEWLINES_RE.sub('\n\n', text)
         
         return text.strip()
     
@@ -620,32 +791,24 @@ class XBRLParser:
         # テキストを整形
         normalized_text = self._normalize_text(text)
         
-        # 改行で分割
-        lines = normalized_text.split('\n')
-        
-        start_idx = None
-        end_idx = None
-        
-        # 開始パターンを検索
-        for i, line in enumerate(lines):
-            for pattern in start_patterns:
-                if pattern in line:
-                    start_idx = i
-                    break
-            if start_idx is not None:
-                break
+        if not start_patterns:
+            return None
         
-        if start_idx is None:
+        # 開始パターンを検索（テキスト全体を1回走査し、一致位置から行番号を求める）
+        start_match = _compile_literals(tuple(start_patterns)).search(normalized_text)
+        if start_match is None:
             return None
+        start_idx = normalized_text.count('\n', 0, start_match.start())
         
-        # 終了パターンを検索（開始位置以降）
-        for i in range(start_idx + 1, len(lines)):
-            for pattern in end_patterns:
-                if pattern in lines[i]:
-                    end_idx = i
-                    break
-            if end_idx is not None:
-                break
+        # 終了パターンを検索（開始行の次の行以降）
+        end_idx = None
+        next_line_pos = normalized_text.find('\n', start_match.end())
+        if end_patterns and next_line_pos != -1:
+            end_match = _compile_literals(tuple(end_patterns)).search(normalized_text, next_line_pos + 1)
+            if end_match is not None:
+                end_idx = start_idx + 1 + normalized_text.count('\n', next_line_pos + 1, end_match.start())
+        
+        lines = normalized_text.split('\n')
         
         # 終了パターンが見つからない場合は、次の主要な見出しまで（最大1000行）
         if end_idx is None:
@@ -659,26 +822,8 @@ class XBRLParser:
     
     def _extract_text_from_html_element_simple(self, element: ET.Element) -> str:
         """HTMLタグを含む要素からテキストを抽出（テーブル判定なし）"""
-        # 要素のテキストを取得
-        text_parts = []
-        
-        # 要素の直接のテキスト
-        if element.text:
-            text = element.text.strip()
-            if text:
-                text_parts.append(text)
-        
-        # 子要素からテキストを再帰的に抽出
-        for child in element:
-            child_text = self._extract_text_from_html_element_simple(child)
-            if child_text:
-                text_parts.append(child_text)
-            
-            # 子要素の後のテキスト（tail）
-            if child.tail:
-                tail_text = child.tail.strip()
-                if tail_text:
-                    text_parts.append(tail_text)
+        # 要素の直接のテキスト、子孫要素のテキストとtailを文書順に取得
+        text_parts = [text for text in (part.strip() for part in element.itertext()) if text]
         
         combined_text = '\n'.join(text_parts)
         
@@ -686,10 +831,10 @@ class XBRLParser:
         combined_text = html.unescape(combined_text)
         
         # HTMLタグを除去（正規表現で）
-        combined_text = re.sub(r'<[^>]+>', '', combined_text)
+        combined_text = _HTML_TAG_RE.sub('', combined_text)
         
         # 余分な空白を整理
-        combined_text = re.sub(r'\s+', ' ', combined_text)
+        combined_text = _WHITESPACE_RE.sub(' ', combined_text)
         combined_text = combined_text.strip()
         
         return combined_text
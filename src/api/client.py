@@ -6,8 +6,9 @@ APIキー認証とデータ取得機能を提供します。
 """
 
 import time
+from bisect import bisect_right
 from typing import Optional, Dict, List, Any
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import requests
 from ..config import config
@@ -20,6 +21,7 @@ class JQuantsAPIClient:
     MAX_RETRIES = 5  # レート制限対応のため増加
     RETRY_DELAY = 2.0  # 秒（レート制限対応のため増加）
     RATE_LIMIT_WAIT = 60  # レート制限時の待機時間（秒）
+    SUBSCRIPTION_START = "2021-01-09"  # サブスクリプション開始日（これより前の株価は取得できない）
 
     def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """
@@ -247,6 +249,122 @@ class JQuantsAPIClient:
 
         return self._get_all_pages("/equities/master", params)
 
+    def get_prices_range(
+        self,
+        code: str,
+        from_date: str,
+        to_date: str
+    ) -> Dict[str, float]:
+        """
+        期間内の終値を一括取得（年度末株価の一括取得用）
+
+        Args:
+            code: 銘柄コード（5桁、例: "27800"）
+            from_date: 開始日（YYYY-MM-DD）
+            to_date: 終了日（YYYY-MM-DD）
+
+        Returns:
+            日付（YYYY-MM-DD形式）をキー、終値（AdjC、なければC）を値とする辞書
+        """
+        bars = self.get_daily_bars(code=code, from_date=from_date, to_date=to_date)
+
+        prices = {}
+        for bar in bars:
+            bar_date = bar.get("Date")
+            price = bar.get("AdjC") or bar.get("C")
+            if not bar_date or price is None:
+                continue
+            if len(bar_date) == 8:  # YYYYMMDD形式
+                bar_date = f"{bar_date[:4]}-{bar_date[4:6]}-{bar_date[6:8]}"
+            prices[bar_date] = price
+
+        return prices
+
+    def get_prices_at_dates(
+        self,
+        code: str,
+        dates: List[str],
+        lookback_days: int = 10,
+        errors: Optional[Dict[str, str]] = None
+    ) -> Dict[str, float]:
+        """
+        複数の日付の終値を1回の期間指定リクエストで取得（年度末株価の一括取得用）
+        
+        指定日が休日の場合は、lookback_days日前までの直前の営業日の終値を使用します。
+        サブスクリプション開始日（SUBSCRIPTION_START）より前の日付と形式が不正な日付は除外し、
+        期間指定のリクエストが失敗した場合は日付ごとにget_price_at_dateで取得します。
+
+        Args:
+            code: 銘柄コード（5桁、例: "27800"）
+            dates: 日付のリスト（YYYYMMDD または YYYY-MM-DD）
+            lookback_days: 直前の営業日を遡る最大日数（デフォルト: 10）
+            errors: 指定した場合、取得できなかった日付（指定時の形式）をキー、理由を値として格納
+
+        Returns:
+            指定された日付（指定時の形式）をキー、終値を値とする辞書（取得できない日付は含まない）
+        """
+        if errors is None:
+            errors = {}
+        
+        # 日付をYYYY-MM-DD形式に統一し、日付ごとに解析（不正な日付のみ除外）
+        normalized = {}
+        targets = {}
+        for date in dates:
+            if not date:
+                continue
+            if date[4:5] == "-":
+                value = date[:10]
+            else:
+                value = f"{date[:4]}-{date[4:6]}-{date[6:8]}"
+            try:
+                target = datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                errors[date] = "日付の形式が不正"
+                continue
+            if value < self.SUBSCRIPTION_START:
+                errors[date] = "サブスクリプション範囲外"
+                continue
+            normalized[date] = value
+            targets[date] = target
+        if not targets:
+            return {}
+        
+        # 開始日はサブスクリプション開始日より前にしない
+        from_date = max(
+            (min(targets.values()) - timedelta(days=lookback_days)).strftime("%Y-%m-%d"),
+            self.SUBSCRIPTION_START
+        )
+        to_date = max(normalized.values())
+        try:
+            prices = self.get_prices_range(code, from_date, to_date)
+        except Exception as e:
+            # 範囲外の日付を含む場合などは日付ごとに取得（失敗は該当日付のみ）
+            print(f"⚠️  株価の期間取得に失敗したため日付ごとに取得します: {code} - {e}")
+            result = {}
+            for date, value in normalized.items():
+                try:
+                    price = self.get_price_at_date(code, value)
+                except Exception as date_error:
+                    errors[date] = str(date_error)
+                    continue
+                if price is not None:
+                    result[date] = price
+            return result
+        
+        trading_days = sorted(prices)
+        result = {}
+        for date, target in targets.items():
+            # 指定日以前で最も近い営業日を探す
+            idx = bisect_right(trading_days, normalized[date])
+            if idx == 0:
+                continue
+            trading_day = trading_days[idx - 1]
+            earliest = (target - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+            if trading_day >= earliest:
+                result[date] = prices[trading_day]
+        
+        return result
+    
     def get_price_at_date(
         self,
         code: str,
@@ -17,6 +17,54 @@ from ..config import config
 logger = logging.getLogger(__name__)
 
 
+def _parse_date(value: str) -> datetime:
+    """
+    日付文字列（YYYY-MM-DD形式またはYYYYMMDD形式）をパース
+    
+    ISO形式はdatetime.fromisoformatで高速にパースし、失敗した場合のみstrptimeを使用します。
+    
+    Args:
+        value: 日付文字列（先頭10文字または8文字を使用）
+        
+    Returns:
+        パース結果
+        
+    Raises:
+        ValueError: 日付としてパースできない場合
+    """
+    try:
+        return datetime.fromisoformat(value[:10])
+    except ValueError:
+        return datetime.strptime(value[:8], "%Y%m%d")
+
+
+def _resolve_report_type(doc_type_code: str, doc_description: str) -> str:
+    """
+    書類種別（有価証券報告書／半期報告書）を判定
+    
+    docTypeCodeの先頭3桁（030=有価証券報告書、050=半期報告書）で判定し、
+    判定できない場合は書類名（docDescription）から判定します。
+    
+    Args:
+        doc_type_code: 書類種別コード
+        doc_description: 書類名
+        
+    Returns:
+        書類種別。判定できない場合は「不明」
+    """
+    prefix = doc_type_code[:3] if doc_type_code else ""
+    if prefix == "030":
+        return "有価証券報告書"
+    if prefix == "050":
+        return "半期報告書"
+    if doc_description:
+        if "有価証券報告書" in doc_description:
+            return "有価証券報告書"
+        if "半期報告書" in doc_description:
+            return "半期報告書"
+    return "不明"
+
+
 class EdinetAPIClient:
     """EDINET API クライアントクラス"""
 
@@ -172,10 +220,8 @@ class EdinetAPIClient:
                     # 年度情報がない場合は年度終了日から計算
                     if fiscal_year is None:
                         try:
-                            if len(fy_end) >= 10:
-                                period_date = datetime.strptime(fy_end[:10], "%Y-%m-%d")
-                            elif len(fy_end) >= 8:
-                                period_date = datetime.strptime(fy_end[:8], "%Y%m%d")
+                            if len(fy_end) >= 8:
+                                period_date = _parse_date(fy_end)
                             else:
                                 continue
                             
@@ -189,10 +235,8 @@ class EdinetAPIClient:
                     else:
                         # 年度情報がある場合でも、年度終了日をパースしてperiod_endを取得
                         try:
-                            if len(fy_end) >= 10:
-                                period_date = datetime.strptime(fy_end[:10], "%Y-%m-%d")
-                            elif len(fy_end) >= 8:
-                                period_date = datetime.strptime(fy_end[:8], "%Y%m%d")
+                            if len(fy_end) >= 8:
+                                period_date = _parse_date(fy_end)
                             else:
                                 continue
                         except (ValueError, TypeError):
@@ -208,7 +252,7 @@ class EdinetAPIClient:
                     
                     # 開示日が未来の場合は除外（未来の年度データは除外）
                     try:
-                        disc_date_obj = datetime.strptime(disc_date_formatted, "%Y-%m-%d")
+                        disc_date_obj = _parse_date(disc_date_formatted)
                         if disc_date_obj > now:
                             logger.debug(f"開示日が未来のため除外: fiscal_year={fiscal_year}, period_type={period_type}, disc_date={disc_date_formatted}")
                             continue
@@ -222,10 +266,8 @@ class EdinetAPIClient:
                         # 2Qの場合は、CurFYEnが期間終了日（例: 2025-06-30）になっている
                         # これをperiod_endとして使用
                         try:
-                            if len(fy_end) >= 10:
-                                period_end_date = datetime.strptime(fy_end[:10], "%Y-%m-%d")
-                            elif len(fy_end) >= 8:
-                                period_end_date = datetime.strptime(fy_end[:8], "%Y%m%d")
+                            if len(fy_end) >= 8:
+                                period_end_date = _parse_date(fy_end)
                             else:
                                 period_end_date = period_date  # フォールバック
                         except (ValueError, TypeError):
@@ -254,14 +296,12 @@ class EdinetAPIClient:
                         disc_date_str = fy_end_to_disc_date[key]
                         period_end = fy_end_to_period_end[key]
                         try:
-                            disc_date_obj = datetime.strptime(disc_date_str, "%Y-%m-%d")
+                            disc_date_obj = _parse_date(disc_date_str)
                             
                             # period_endがdatetimeオブジェクトでない場合は変換
                             if isinstance(period_end, str):
-                                if len(period_end) >= 10:
-                                    period_end_obj = datetime.strptime(period_end[:10], "%Y-%m-%d")
-                                elif len(period_end) >= 8:
-                                    period_end_obj = datetime.strptime(period_end[:8], "%Y%m%d")
+                                if len(period_end) >= 8:
+                                    period_end_obj = _parse_date(period_end)
                                 else:
                                     logger.debug(f"period_endの形式が不正: {period_end}")
                                     continue
@@ -302,10 +342,8 @@ class EdinetAPIClient:
                         # 変換を試みる
                         if isinstance(period_end, str):
                             try:
-                                if len(period_end) >= 10:
-                                    period_end = datetime.strptime(period_end[:10], "%Y-%m-%d")
-                                elif len(period_end) >= 8:
-                                    period_end = datetime.strptime(period_end[:8], "%Y%m%d")
+                                if len(period_end) >= 8:
+                                    period_end = _parse_date(period_end)
                             except (ValueError, TypeError) as e:
                                 logger.error(f"period_endの変換に失敗: {e}")
                                 period_end = None
@@ -319,15 +357,13 @@ class EdinetAPIClient:
                 
                 if disc_date_str and period_end:
                     try:
-                        disc_date = datetime.strptime(disc_date_str, "%Y-%m-%d")
+                        disc_date = _parse_date(disc_date_str)
                         now = datetime.now()
                         
                         # period_endがdatetimeオブジェクトでない場合は変換
                         if isinstance(period_end, str):
-                            if len(period_end) >= 10:
-                                period_end = datetime.strptime(period_end[:10], "%Y-%m-%d")
-                            elif len(period_end) >= 8:
-                                period_end = datetime.strptime(period_end[:8], "%Y%m%d")
+                            if len(period_end) >= 8:
+                                period_end = _parse_date(period_end)
                             else:
                                 raise ValueError(f"Invalid period_end format: {period_end}")
                         elif not isinstance(period_end, datetime):
@@ -725,7 +761,7 @@ class EdinetAPIClient:
                     if period_end:
                         try:
                             # YYYY-MM-DD形式から年度を抽出
-                            period_date = datetime.strptime(period_end[:10], "%Y-%m-%d")
+                            period_date = _parse_date(period_end)
                             # 3月末が年度終了日の場合、その年度は前年
                             if period_date.month == 3:
                                 doc_year = period_date.year - 1
@@ -944,24 +980,14 @@ class EdinetAPIClient:
                 continue
             
             # 書類種別を判定（有価証券報告書または半期報告書）
-            report_type = None
-            if doc_type and len(doc_type) >= 3:
-                if doc_type[:3] == "030":
-                    report_type = "有価証券報告書"
-                elif doc_type[:3] == "050":
-                    report_type = "半期報告書"
-            if not report_type and doc_description:
-                if "有価証券報告書" in doc_description:
-                    report_type = "有価証券報告書"
-                elif "半期報告書" in doc_description:
-                    report_type = "半期報告書"
+            report_type = _resolve_report_type(doc_type, doc_description)
             
             # 年度を特定（periodEndから年度を抽出）
             year = None
             if period_end:
                 try:
                     # YYYY-MM-DD形式から年度を抽出
-                    period_date = datetime.strptime(period_end[:10], "%Y-%m-%d")
+                    period_date = _parse_date(period_end)
                     # 3月末が年度終了日の場合、その年度は前年
                     if period_date.month == 3:
                         year = period_date.year - 1
@@ -1022,7 +1048,7 @@ class EdinetAPIClient:
                     "submitDate": submit_date[:10] if submit_date else "",
                     "pdf_path": str(pdf_path) if pdf_path else None,
                     "xbrl_path": str(xbrl_path) if xbrl_path else None,
-                    "docType": report_type or "不明",
+                    "docType": report_type,
                     "docTypeCode": doc_type,
                     "docDescription": doc_description,
                     "filerName": doc.get("filerName", ""),  # 提出者名を追加
@@ -28,6 +28,10 @@ class Config:
         
         # LLM設定
         self.llm_model = os.getenv("LLM_MODEL", "gemma3:1b")
+        # OllamaサーバーのURL（Noneの場合はollamaパッケージの既定値 http://localhost:11434）
+        self.llm_host = os.getenv("OLLAMA_HOST")
+        # Ollamaへの同時リクエスト数（Ollama側のOLLAMA_NUM_PARALLELに合わせる）
+        self.llm_num_parallel = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
         
         # 分析設定
         # ANALYSIS_YEARSは環境変数で指定可能（指定しない場合は利用可能なデータを最大限使用）
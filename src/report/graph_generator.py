@@ -49,8 +49,7 @@ class GraphGenerator:
             try:
                 if isinstance(fy_end, str):
                     if len(fy_end) >= 10:
-                        from datetime import datetime
-                        period_date = datetime.strptime(fy_end[:10], "%Y-%m-%d")
+                        period_date = datetime(int(fy_end[0:4]), int(fy_end[5:7]), int(fy_end[8:10]))
                         # 3月末が年度終了日の場合、その年度は前年
                         if period_date.month == 3:
                             fiscal_year = period_date.year - 1
@@ -166,8 +165,7 @@ class GraphGenerator:
                 if isinstance(fy_end, str):
                     if len(fy_end) >= 10:
                         # YYYY-MM-DD形式から年度を計算
-                        from datetime import datetime
-                        period_date = datetime.strptime(fy_end[:10], "%Y-%m-%d")
+                        period_date = datetime(int(fy_end[0:4]), int(fy_end[5:7]), int(fy_end[8:10]))
                         # 3月末が年度終了日の場合、その年度は前年
                         if period_date.month == 3:
                             fiscal_year = period_date.year - 1
@@ -684,18 +682,41 @@ class GraphGenerator:
         graphs.append(graph_obj_mv)
         
         # 5. 株価 vs EPS（指数化比較）
-        from ..utils.financial_data import get_fiscal_year_end_price
         from ..api.client import JQuantsAPIClient
         
         code = result.get("code")
         name = result.get("name", "")
         
-        # APIクライアントを新規作成
-        try:
-            api_client = JQuantsAPIClient()
-        except Exception as e:
-            logger.warning(f"APIクライアント作成失敗（グラフ4スキップ）: {e}")
-            api_client = None
+        # 年度末株価は分析結果（metrics）の値を使用し、ない年度のみAPIからまとめて取得
+        fy_end_prices = {
+            fy_end: year.get("price")
+            for fy_end, year in zip(reversed_fy_ends, reversed_years)
+            if fy_end and year.get("price")
+        }
+        # サブスクリプション開始日より前の年度は取得できないため対象外
+        # （YYYY-MM-DD形式に揃えて比較）
+        missing_fy_ends = [
+            fy_end for i, fy_end in enumerate(reversed_fy_ends)
+            if fy_end and fy_end not in fy_end_prices and i < len(eps_values) and eps_values[i] is not None
+            and (fy_end[:10] if fy_end[4:5] == "-" else f"{fy_end[:4]}-{fy_end[4:6]}-{fy_end[6:8]}")
+            >= JQuantsAPIClient.SUBSCRIPTION_START
+        ]
+        
+        api_client = None
+        if missing_fy_ends:
+            # APIクライアントを新規作成
+            try:
+                api_client = JQuantsAPIClient()
+            except Exception as e:
+                logger.warning(f"APIクライアント作成失敗（グラフ4スキップ）: {e}")
+                api_client = None
+        
+        if api_client:
+            try:
+                # 期間指定の1リクエストで取得（休日の場合は直前の営業日、失敗時は日付ごとに取得）
+                fy_end_prices.update(api_client.get_prices_at_dates(code, missing_fy_ends))
+            except Exception as e:
+                logger.warning(f"株価 vs EPS: 年度末株価の取得に失敗: {e}")
         
         # 株価データ取得（年度末終値）
         stock_prices = []
@@ -703,14 +724,14 @@ class GraphGenerator:
         aligned_fy_ends = []
         aligned_eps = []
         
-        if api_client:
+        if fy_end_prices or api_client:
             # 逆順にしたデータを使用
             for i, fy_end in enumerate(reversed_fy_ends):
                 eps = eps_values[i] if i < len(eps_values) else None
                 fiscal_year_str = reversed_fiscal_years[i] if i < len(reversed_fiscal_years) else "不明"  # 事前計算済みの値を使用
                 
                 if fy_end and eps is not None:
-                    price = get_fiscal_year_end_price(api_client, code, fy_end)
+                    price = fy_end_prices.get(fy_end)
                     if price:
                         stock_prices.append(price)
                         stock_years.append(fiscal_year_str)
@@ -115,11 +115,9 @@ def run_analysis(
             # get_report_dataは内部で再度analyze_stockを呼び出すため、結果を再利用
             comparison = analyzer.compare_with_previous(code) if hasattr(analyzer, 'compare_with_previous') else None
             
-            report_data = {
-                **result,
-                "comparison": comparison,
-                "quarterly_metrics": None,
-            }
+            report_data = result
+            report_data["comparison"] = comparison
+            report_data["quarterly_metrics"] = None
             
             if report_data:
                 # EDINETデータの詳細はprogress_callbackで表示されるため、ここでは完了表示のみ
@@ -152,12 +150,10 @@ def run_analysis(
     
     except Exception as e:
         if not error_message:
-            import traceback
-            error_detail = traceback.format_exc()
             error_message = f"銘柄コード {code}: 予期しないエラーが発生しました - {str(e)}"
-            # デバッグ用に詳細をログに出力
+            # デバッグ用に詳細をログに出力（exc_infoでトレースバックを付与）
             import logging
-            logging.error(f"銘柄コード {code} の分析エラー詳細:\n{error_detail}")
+            logging.error(f"銘柄コード {code} の分析エラー詳細", exc_info=True)
         # エラーが発生した場合は処理を中断
         raise
 
@@ -10,6 +10,12 @@ from datetime import datetime, date
 from typing import Any, Optional, Dict
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class CacheManager:
     """
@@ -43,6 +49,9 @@ class CacheManager:
         metadata_path = self._get_metadata_file_path()
         if metadata_path.exists():
             try:
+                # get()のたびに読み込むため、orjsonが利用できる場合はそちらを使用
+                if ORJSON_AVAILABLE:
+                    return orjson.loads(metadata_path.read_bytes())
                 with open(metadata_path, "r", encoding="utf-8") as f:
                     return json.load(f)
             except (json.JSONDecodeError, IOError):
@@ -52,6 +61,9 @@ class CacheManager:
     def _save_metadata(self, metadata: Dict[str, str]):
         """メタデータを保存"""
         metadata_path = self._get_metadata_file_path()
+        if ORJSON_AVAILABLE:
+            metadata_path.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+            return
         with open(metadata_path, "w", encoding="utf-8") as f:
             json.dump(metadata, f, ensure_ascii=False, indent=2)
     
@@ -85,7 +97,7 @@ class CacheManager:
         try:
             with open(cache_file, "rb") as f:
                 return pickle.load(f)
-        except (pickle.UnpicklingError, IOError):
+        except (pickle.UnpicklingError, EOFError, IOError):
             return None
     
     def set(self, key: str, value: Any):
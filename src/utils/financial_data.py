@@ -4,6 +4,7 @@
 
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
+from functools import lru_cache
 import math
 
 
@@ -19,6 +20,22 @@ def extract_annual_data(
     Returns:
         年度データ（CurPerType="FY"）のリスト、年度終了日でソート（重複除去済み、未来の年度は除外）
     """
+    return extract_annual_data_with_stats(quarterly_data)[0]
+
+
+def extract_annual_data_with_stats(
+    quarterly_data: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    四半期データから年度データを抽出し、フィルタ前の年度データ件数も返す
+
+    Args:
+        quarterly_data: fin-summaryから取得した四半期データ
+
+    Returns:
+        (年度データのリスト, CurPerType="FY"の件数) のタプル
+        （年度データはextract_annual_dataと同じく年度終了日でソート、重複除去済み、未来の年度は除外）
+    """
     from datetime import datetime
     
     # 現在日付を取得
@@ -27,9 +44,11 @@ def extract_annual_data(
     current_month = today.month
     
     annual_data = []
+    fy_record_count = 0
     for record in quarterly_data:
         if record.get("CurPerType") != "FY":
             continue
+        fy_record_count += 1
         
         # 未来の年度データを除外（年度終了日と開示日の両方をチェック）
         fy_end = record.get("CurFYEn", "")
@@ -163,7 +182,7 @@ def extract_annual_data(
                 unique_annual_data[idx] = record
                 seen_years[fy_end] = record
     
-    return unique_annual_data
+    return unique_annual_data, fy_record_count
 
 
 def calculate_cagr(
@@ -537,10 +556,13 @@ def get_fiscal_year_end_price(
         return None
 
 
+@lru_cache(maxsize=8192)
 def _calculate_quarter_end_date(fy_end: str, per_type: str) -> Optional[str]:
     """
     CurFYEn（年度終了日）とCurPerType（四半期タイプ）から、実際の四半期末日を計算
     
+    引数のみで結果が決まる純粋関数のため、結果をキャッシュします。
+    
     Args:
         fy_end: 年度終了日（YYYYMMDD形式またはYYYY-MM-DD形式）
         per_type: 四半期タイプ（"1Q", "2Q", "3Q", "4Q", "Q1", "Q2", "Q3", "Q4"）
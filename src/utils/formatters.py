@@ -47,12 +47,12 @@ def extract_fiscal_year_from_fy_end(fy_end: Optional[str]) -> str:
         return ""
     try:
         if isinstance(fy_end, str):
-            if len(fy_end) >= 10:
-                period_date = datetime.strptime(fy_end[:10], "%Y-%m-%d")
-            elif len(fy_end) >= 8:
-                period_date = datetime.strptime(fy_end[:8], "%Y%m%d")
+            # 位置が固定の数字を直接切り出してパース（書式文字列の解釈を省く）
+            # 5文字目の区切り文字で書式を判定（桁不足はint変換のValueErrorで弾く）
+            if fy_end[4:5] == "-":
+                period_date = datetime(int(fy_end[0:4]), int(fy_end[5:7]), int(fy_end[8:10]))
             else:
-                return ""
+                period_date = datetime(int(fy_end[0:4]), int(fy_end[4:6]), int(fy_end[6:8]))
         else:
             return ""
         